@@ -4,6 +4,17 @@ This module defines a custom reasoning and action agent graph.
 It invokes tools in a simple loop.
 """
 
-from react_agent.graph import graph
+from typing import Any
 
 __all__ = ["graph"]
+
+
+def __getattr__(name: str) -> Any:
+    # The graph is imported lazily so that its own modules can import
+    # ``react_agent.configuration`` & co. without a circular import.
+    if name == "graph":
+        from react_agent.graph import graph
+
+        globals()["graph"] = graph
+        return graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,276 @@
+r"""Tune the retrieval and interview parameters against a latency or token target.
+
+The tuner never calls a live service. It samples per-call latencies and token
+counts from a recorded cassette (see ``react_agent.cassette``), or from
+synthetic defaults, and replays them through a model of the research graph:
+
+- ``process_requirements`` and ``create_developer``: one LLM call each. With
+  ``requirements_mode="expanded"``, ``process_requirements`` lists headlines
+  and then expands ``max_requirements`` of them in parallel.
+- ``max_developer`` interviews in parallel, each running ``max_num_turns``
+  turns of question -> (web search || Wikipedia search) -> answer, where both
+  searches first generate a query with the LLM, and ending with ``write_section``.
+- The three report writers in parallel.
+
+Answers and sections also pay for the retrieved documents they carry in their
+prompt, so more results per search cost tokens on every later call. Early
+stopping and model failover are not modeled, which makes estimates an upper
+bound.
+
+The recommended parameters are written as a profile that the graph picks up
+through ``Configuration.from_runnable_config`` with the ``tuning_profile`` key::
+
+    python -m react_agent.autotune --cassette run.jsonl --p95-latency 180 \
+        --token-budget 150000 --output profiles/fast.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from react_agent.cassette import Cassette
+from react_agent.configuration import Configuration
+
+SEARCH_SPACE: dict[str, list[int]] = {
+    "max_developer": [1, 2, 3, 4],
+    "max_num_turns": [1, 2, 3],
+    "web_search_max_results": [1, 3, 5],
+    "wikipedia_max_docs": [0, 1, 2],
+}
+"""Values explored for every tunable parameter, by default."""
+
+
+@dataclass
+class CallSamples:
+    """Observed latencies (seconds) and sizes (tokens) of the graph's external calls."""
+
+    llm_latency: list[float] = field(default_factory=lambda: [2.0, 3.5, 5.0, 8.0])
+    llm_tokens: list[int] = field(default_factory=lambda: [900, 1500, 2500])
+    web_latency: list[float] = field(default_factory=lambda: [1.0, 1.8, 3.0])
+    wikipedia_latency: list[float] = field(default_factory=lambda: [0.8, 1.5, 4.0])
+    web_doc_tokens: float = 300.0
+    wikipedia_doc_tokens: float = 1000.0
+
+    @classmethod
+    def from_cassette(cls, path: str) -> CallSamples:
+        """Collect samples from a cassette recorded with ``REACT_AGENT_CASSETTE_MODE=record``."""
+        entries = list(Cassette(path, "replay").entries.values())
+        samples = cls()
+
+        def of(kind: str) -> list[dict[str, Any]]:
+            return [e for e in entries if e["kind"] == kind]
+
+        if llm := of("llm"):
+            samples.llm_latency = [e["latency"] for e in llm]
+            samples.llm_tokens = [
+                e["usage"]["total_tokens"] for e in llm if e.get("usage")
+            ] or samples.llm_tokens
+        if web := of("tavily"):
+            samples.web_latency = [e["latency"] for e in web]
+            docs = [doc for e in web for doc in e["response"] or []]
+            if docs:
+                samples.web_doc_tokens = sum(
+                    len(doc.get("content", "")) / 4 for doc in docs
+                ) / len(docs)
+        if wikipedia := of("wikipedia"):
+            samples.wikipedia_latency = [e["latency"] for e in wikipedia]
+            docs = [doc for e in wikipedia for doc in e["response"] or []]
+            if docs:
+                samples.wikipedia_doc_tokens = sum(
+                    len(doc["page_content"]) / 4 for doc in docs
+                ) / len(docs)
+        return samples
+
+
+def simulate_run(
+    params: dict[str, int],
+    samples: CallSamples,
+    rng: random.Random,
+    configuration: Optional[Configuration] = None,
+) -> tuple[float, int]:
+    """Simulate one run of the research graph and return its (latency, tokens).
+
+    ``configuration`` gives the settings that are not tuned, such as
+    ``requirements_mode``.
+    """
+    configuration = configuration or Configuration()
+    latency = 0.0
+    tokens = 0
+
+    def llm(extra_tokens: float = 0.0) -> float:
+        nonlocal tokens
+        tokens += rng.choice(samples.llm_tokens) + int(extra_tokens)
+        return rng.choice(samples.llm_latency)
+
+    # Requirements, then developers
+    if configuration.requirements_mode == "expanded":
+        expansions = [llm() for _ in range(configuration.max_requirements)]
+        latency += llm() + max(expansions, default=0.0)
+    else:
+        latency += llm()
+    latency += llm()
+
+    # Interviews run in parallel; each turn searches the web and Wikipedia in parallel
+    docs_per_turn = (
+        params["web_search_max_results"] * samples.web_doc_tokens
+        + params["wikipedia_max_docs"] * samples.wikipedia_doc_tokens
+    )
+    interviews = []
+    for _ in range(params["max_developer"]):
+        elapsed = 0.0
+        for turn in range(1, params["max_num_turns"] + 1):
+            question = llm()
+            web = llm() + rng.choice(samples.web_latency)
+            wikipedia = (
+                llm() + rng.choice(samples.wikipedia_latency)
+                if params["wikipedia_max_docs"]
+                else 0.0
+            )
+            answer = llm(turn * docs_per_turn)
+            elapsed += question + max(web, wikipedia) + answer
+        elapsed += llm(params["max_num_turns"] * docs_per_turn)
+        interviews.append(elapsed)
+    latency += max(interviews, default=0.0)
+
+    # Report body, introduction and conclusion in parallel
+    latency += max(llm(), llm(), llm())
+    return latency, tokens
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def evaluate(
+    params: dict[str, int],
+    samples: CallSamples,
+    runs: int = 200,
+    seed: int = 0,
+    configuration: Optional[Configuration] = None,
+) -> dict[str, float]:
+    """Estimate the latency and token distribution of a parameter set."""
+    rng = random.Random(seed)
+    results = [simulate_run(params, samples, rng, configuration) for _ in range(runs)]
+    latencies = [latency for latency, _ in results]
+    tokens = [float(t) for _, t in results]
+    return {
+        "p50_latency_s": round(_percentile(latencies, 0.5), 2),
+        "p95_latency_s": round(_percentile(latencies, 0.95), 2),
+        "mean_tokens": round(sum(tokens) / len(tokens)),
+        "p95_tokens": round(_percentile(tokens, 0.95)),
+    }
+
+
+def coverage(params: dict[str, int]) -> int:
+    """Score how much research a parameter set buys: interviews x turns x documents."""
+    return (
+        params["max_developer"]
+        * params["max_num_turns"]
+        * (params["web_search_max_results"] + params["wikipedia_max_docs"])
+    )
+
+
+def autotune(
+    samples: CallSamples,
+    *,
+    target_p95_latency_s: Optional[float] = None,
+    token_budget: Optional[int] = None,
+    search_space: Optional[dict[str, list[int]]] = None,
+    runs: int = 200,
+    configuration: Optional[Configuration] = None,
+) -> dict[str, Any]:
+    """Pick the parameters with the most coverage that meet the targets.
+
+    ``token_budget`` bounds the p95 token count of a run. When no parameter set
+    meets the targets, the fastest one is returned with ``"feasible": False``.
+    """
+    space = search_space or SEARCH_SPACE
+    candidates = []
+    for values in itertools.product(*space.values()):
+        params = dict(zip(space, values))
+        metrics = evaluate(params, samples, runs=runs, configuration=configuration)
+        meets_targets = (
+            target_p95_latency_s is None
+            or metrics["p95_latency_s"] <= target_p95_latency_s
+        ) and (token_budget is None or metrics["p95_tokens"] <= token_budget)
+        candidates.append((meets_targets, params, metrics))
+
+    feasible = [c for c in candidates if c[0]]
+    if feasible:
+        _, params, metrics = max(
+            feasible, key=lambda c: (coverage(c[1]), -c[2]["p95_latency_s"])
+        )
+    else:
+        _, params, metrics = min(candidates, key=lambda c: c[2]["p95_latency_s"])
+    return {
+        "parameters": params,
+        "metrics": metrics,
+        "feasible": bool(feasible),
+        "targets": {
+            "p95_latency_s": target_p95_latency_s,
+            "token_budget": token_budget,
+        },
+    }
+
+
+def write_profile(path: str, profile: dict[str, Any]) -> None:
+    """Write a profile for ``Configuration(tuning_profile=path)``."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the tuner from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Tune the retrieval and interview parameters."
+    )
+    parser.add_argument("--cassette", help="recorded run to sample call costs from")
+    parser.add_argument("--p95-latency", type=float, help="target p95 latency (s)")
+    parser.add_argument("--token-budget", type=int, help="p95 token budget per run")
+    parser.add_argument(
+        "--runs", type=int, default=200, help="simulated runs per candidate"
+    )
+    parser.add_argument(
+        "--requirements-mode", choices=["single", "expanded"], default="single"
+    )
+    parser.add_argument(
+        "--max-requirements",
+        type=int,
+        default=5,
+        help="requirement headlines expanded in expanded mode",
+    )
+    parser.add_argument("--output", default="profiles/tuned.json")
+    args = parser.parse_args(argv)
+
+    samples = (
+        CallSamples.from_cassette(args.cassette) if args.cassette else CallSamples()
+    )
+    profile = autotune(
+        samples,
+        target_p95_latency_s=args.p95_latency,
+        token_budget=args.token_budget,
+        runs=args.runs,
+        configuration=Configuration(
+            requirements_mode=args.requirements_mode,
+            max_requirements=args.max_requirements,
+        ),
+    )
+    write_profile(args.output, profile)
+    if not profile["feasible"]:
+        parser.exit(
+            1, f"No parameters meet the targets; wrote the fastest to {args.output}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Generate reports for many topics concurrently.
+
+Topics are read from a JSON-lines file, one object per line::
+
+    {"id": "todo-app", "topic": "A todo app with offline sync", "max_developer": 3,
+     "feedback": {"human_feedback": ["Add a security reviewer", "approve"]}}
+
+Only ``topic`` is required; ``id`` defaults to the line number. Every topic runs
+on its own thread of the research graph and the ``human_feedback*``
+interrupts are answered from ``feedback`` (answers are used in order), falling
+back to ``DEFAULT_FEEDBACK``, which moves straight on to the interviews.
+
+All runs share the process' model client and search cache (``node.llm`` and
+``utils.search_cache``) and at most ``concurrency`` of them run at a time. Each
+result is appended to the output file as soon as its run finishes; topics
+that already have a successful result there are skipped, so an interrupted
+batch resumes where it stopped (runs in flight restart from the beginning).
+
+    python -m react_agent.batch topics.jsonl reports.jsonl --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langgraph.checkpoint.memory import MemorySaver
+
+from react_agent.resilience import breaker_metrics
+from react_agent.utils import search_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEEDBACK: dict[str, str] = {
+    # Anything but "approve" moves on to creating the developers
+    "human_feedback_for_requirements": "",
+    "human_feedback": "approve",
+}
+"""Answer given to each human feedback interrupt when a topic has none left."""
+
+
+class TokenCounter(BaseCallbackHandler):
+    """Callback handler summing the tokens reported by chat model calls."""
+
+    def __init__(self) -> None:
+        """Start counting from zero."""
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Add the usage of a finished call."""
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                if isinstance(generation, ChatGeneration):
+                    usage = getattr(generation.message, "usage_metadata", None) or {}
+                    tokens += usage.get("total_tokens", 0)
+        with self._lock:
+            self.tokens += tokens
+
+
+def read_topics(path: str) -> list[dict[str, Any]]:
+    """Read the topics of a batch, giving every topic an ``id``."""
+    topics = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                record = json.loads(line)
+                record.setdefault("id", str(number))
+                topics.append(record)
+    return topics
+
+
+def completed_ids(path: str) -> set[str]:
+    """Return the ids that already have a successful result in ``path``."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {
+            record["id"]
+            for record in map(json.loads, filter(str.strip, f))
+            if record.get("status") == "ok"
+        }
+
+
+async def run_topic(
+    graph: Any, record: dict[str, Any], configurable: dict[str, Any]
+) -> dict[str, Any]:
+    """Run the research graph for one topic, answering its interrupts."""
+    counter = TokenCounter()
+    config = {
+        "configurable": {**configurable, "thread_id": f"batch-{record['id']}"},
+        "callbacks": [counter],
+    }
+    scripted = {
+        node: list(answers) for node, answers in (record.get("feedback") or {}).items()
+    }
+    first_input: dict[str, Any] = {"topic": record["topic"]}
+    if "max_developer" in record:
+        first_input["max_developer"] = record["max_developer"]
+    # Later invocations resume from the checkpoint
+    graph_input: Optional[dict[str, Any]] = first_input
+
+    start = time.perf_counter()
+    while True:
+        await graph.ainvoke(graph_input, config)
+        graph_input = None
+        snapshot = await graph.aget_state(config)
+        if not snapshot.next:
+            break
+        node = snapshot.next[0]
+        if node in DEFAULT_FEEDBACK:
+            answers = scripted.get(node) or [DEFAULT_FEEDBACK[node]]
+            await graph.aupdate_state(
+                config, {"human_developer_feedback": answers.pop(0)}, as_node=node
+            )
+
+    values = snapshot.values
+    return {
+        "id": record["id"],
+        "topic": record["topic"],
+        "status": "ok",
+        "final_report": values.get("final_report"),
+        "requirements": values.get("requirements"),
+        "requirement_details": [
+            r.model_dump() for r in values.get("requirement_details", [])
+        ],
+        "developers": [d.model_dump() for d in values.get("developers", [])],
+        "developer_merge_report": values.get("developer_merge_report"),
+        "elapsed_s": round(time.perf_counter() - start, 2),
+        "tokens": counter.tokens,
+    }
+
+
+async def run_batch(
+    topics_path: str,
+    output_path: str,
+    *,
+    concurrency: int = 4,
+    configurable: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Run every pending topic of ``topics_path`` and return throughput statistics."""
+    # Imported here: loading the graph creates the model client, which needs API keys
+    from react_agent.graph import builder, graph
+
+    runnable = builder.compile(
+        checkpointer=MemorySaver(), interrupt_before=list(graph.interrupt_before_nodes)
+    )
+    done = completed_ids(output_path)
+    pending = [t for t in read_topics(topics_path) if t["id"] not in done]
+    logger.info("%d topic(s) to run, %d already done", len(pending), len(done))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    write_lock = asyncio.Lock()
+    results: list[dict[str, Any]] = []
+
+    async def run_one(record: dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                result = await run_topic(runnable, record, configurable or {})
+            except Exception as e:
+                logger.exception("Topic %s failed", record["id"])
+                result = {
+                    "id": record["id"],
+                    "topic": record["topic"],
+                    "status": "error",
+                    "error": repr(e),
+                }
+        async with write_lock:
+            with open(output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result) + "\n")
+            results.append(result)
+            logger.info(
+                "[%d/%d] %s: %s",
+                len(results),
+                len(pending),
+                record["id"],
+                result["status"],
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(record) for record in pending))
+    elapsed = time.perf_counter() - start
+
+    tokens = sum(r.get("tokens", 0) for r in results)
+    return {
+        "runs": len(results),
+        "succeeded": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] != "ok" for r in results),
+        "elapsed_s": round(elapsed, 2),
+        "runs_per_minute": round(len(results) / elapsed * 60, 2) if elapsed else 0.0,
+        "tokens": tokens,
+        "tokens_per_second": round(tokens / elapsed, 1) if elapsed else 0.0,
+        "search_cache_hits": search_cache.hits,
+        "search_cache_misses": search_cache.misses,
+        "model_breakers": breaker_metrics(),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run a batch from the command line."""
+    parser = argparse.ArgumentParser(description="Generate reports for many topics.")
+    parser.add_argument("topics", help="JSON-lines file of topics")
+    parser.add_argument("output", help="JSON-lines file results are appended to")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--configurable",
+        type=json.loads,
+        default={},
+        help="JSON object of Configuration values, e.g. '{\"max_num_turns\": 1}'",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    stats = asyncio.run(
+        run_batch(
+            args.topics,
+            args.output,
+            concurrency=args.concurrency,
+            configurable=args.configurable,
+        )
+    )
+    logger.info("Batch finished: %s", json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
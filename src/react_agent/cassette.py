@@ -0,0 +1,251 @@
+"""Record and replay the agent's LLM and search I/O.
+
+A cassette is a JSON-lines file (gzip-compressed when the path ends in ``.gz``)
+holding one entry per model or search call: the request fingerprint, the
+response, the token usage and the latency observed while recording. It is
+selected with two environment variables:
+
+- ``REACT_AGENT_CASSETTE``: path of the cassette file.
+- ``REACT_AGENT_CASSETTE_MODE``: ``record`` to call the live services and
+  append every response, ``replay`` to serve responses from the cassette
+  (a missing entry raises ``CassetteMiss``), or ``replay_timed`` to also
+  sleep for the recorded latency.
+
+Models plug in through the LangChain cache interface (``cassette.llm_cache``);
+search calls go through ``Cassette.call`` / ``Cassette.acall``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import IO, Any, Awaitable, Callable, Optional, Sequence, TypeVar, cast
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+
+T = TypeVar("T")
+
+MODES = ("off", "record", "replay", "replay_timed")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def _fingerprint(kind: str, request: Any) -> str:
+    raw = json.dumps([kind, request], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+_VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _normalize_prompt(prompt: str) -> Any:
+    """Drop the message fields that differ between a live and a replayed run.
+
+    Generated messages fed back into later prompts carry run ids, provider
+    metadata and usage, and LangChain adds ``total_cost`` to cache hits.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return messages
+    for message in messages:
+        kwargs = message.get("kwargs") if isinstance(message, dict) else None
+        if isinstance(kwargs, dict):
+            for name in _VOLATILE_MESSAGE_FIELDS:
+                kwargs.pop(name, None)
+    return messages
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return cast(IO[str], gzip.open(path, mode + "t", encoding="utf-8"))
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """A recorded set of LLM and search responses."""
+
+    def __init__(self, path: Optional[str] = None, mode: str = "off") -> None:
+        """Load the entries of ``path``, if it exists, for the given mode."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {MODES}")
+        self.path = path
+        self.mode = mode if path else "off"
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.mode != "off" and path and os.path.exists(path):
+            with _open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry
+        self.llm_cache: Optional[BaseCache] = (
+            CassetteCache(self) if self.mode != "off" else None
+        )
+
+    @classmethod
+    def from_env(cls) -> Cassette:
+        """Create the cassette selected by the environment, off by default."""
+        return cls(
+            os.environ.get("REACT_AGENT_CASSETTE") or None,
+            os.environ.get("REACT_AGENT_CASSETTE_MODE", "replay"),
+        )
+
+    @property
+    def replaying(self) -> bool:
+        """Whether responses are served from the cassette."""
+        return self.mode in ("replay", "replay_timed")
+
+    def get(self, kind: str, request: Any) -> dict[str, Any]:
+        """Return the recorded entry for a request.
+
+        Raises:
+            CassetteMiss: If the request was never recorded.
+        """
+        entry = self.entries.get(_fingerprint(kind, request))
+        if entry is None:
+            raise CassetteMiss(f"No recorded {kind} response for {str(request)[:200]}")
+        return entry
+
+    def replay(self, kind: str, request: Any) -> dict[str, Any]:
+        """Return the recorded entry for a request, honoring the recorded latency."""
+        entry = self.get(kind, request)
+        if self.mode == "replay_timed":
+            time.sleep(entry["latency"])
+        return entry
+
+    def record(
+        self,
+        kind: str,
+        request: Any,
+        response: Any,
+        latency: float,
+        usage: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Store a response and append it to the cassette file."""
+        entry = {
+            "key": _fingerprint(kind, request),
+            "kind": kind,
+            "latency": round(latency, 4),
+            "usage": usage,
+            "response": response,
+        }
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            self.entries[entry["key"]] = entry
+            assert self.path is not None
+            with _open(self.path, "a") as f:
+                f.write(line + "\n")
+
+    def call(
+        self,
+        kind: str,
+        request: Any,
+        fetch: Callable[[], T],
+        encode: Callable[[T], Any] = lambda response: response,
+        decode: Callable[[Any], T] = lambda response: response,
+    ) -> T:
+        """Run ``fetch`` through the cassette.
+
+        ``request`` must be JSON-serializable and identify the call;
+        ``encode``/``decode`` convert the response to and from JSON.
+        """
+        if self.replaying:
+            return decode(self.replay(kind, request)["response"])
+        start = time.perf_counter()
+        response = fetch()
+        if self.mode == "record":
+            self.record(kind, request, encode(response), time.perf_counter() - start)
+        return response
+
+    async def acall(
+        self,
+        kind: str,
+        request: Any,
+        fetch: Callable[[], Awaitable[T]],
+        encode: Callable[[T], Any] = lambda response: response,
+        decode: Callable[[Any], T] = lambda response: response,
+    ) -> T:
+        """Async version of ``call``."""
+        if self.replaying:
+            entry = self.get(kind, request)
+            if self.mode == "replay_timed":
+                await asyncio.sleep(entry["latency"])
+            return decode(entry["response"])
+        start = time.perf_counter()
+        response = await fetch()
+        if self.mode == "record":
+            self.record(kind, request, encode(response), time.perf_counter() - start)
+        return response
+
+
+class CassetteCache(BaseCache):
+    """LangChain cache that records model generations to, or serves them from, a cassette."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        """Wrap ``cassette``."""
+        self.cassette = cassette
+        self._started: dict[str, float] = {}
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Serve a recorded generation, or start timing a live call."""
+        request = {"prompt": _normalize_prompt(prompt), "llm": llm_string}
+        if self.cassette.replaying:
+            entry = self.cassette.replay("llm", request)
+            return [
+                ChatGeneration(message=message)
+                for message in messages_from_dict(entry["response"])
+            ]
+        self._started[_fingerprint("llm", request)] = time.perf_counter()
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Record the generations of a live call."""
+        request = {"prompt": _normalize_prompt(prompt), "llm": llm_string}
+        started = self._started.pop(_fingerprint("llm", request), time.perf_counter())
+        messages = [g.message for g in return_val if isinstance(g, ChatGeneration)]
+        usage = next(
+            (
+                m.usage_metadata
+                for m in messages
+                if isinstance(m, AIMessage) and m.usage_metadata
+            ),
+            None,
+        )
+        self.cassette.record(
+            "llm",
+            request,
+            [message_to_dict(m) for m in messages],
+            time.perf_counter() - started,
+            dict(usage) if usage else None,
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Forget pending timings; recorded entries are kept."""
+        self._started.clear()
+
+
+def encode_documents(docs: Sequence[Document]) -> list[dict[str, Any]]:
+    """Convert LangChain documents to JSON."""
+    return [{"page_content": d.page_content, "metadata": d.metadata} for d in docs]
+
+
+def decode_documents(data: list[dict[str, Any]]) -> list[Document]:
+    """Rebuild LangChain documents from ``encode_documents`` output."""
+    return [Document(**d) for d in data]
+
+
+cassette = Cassette.from_env()
+"""The process-wide cassette configured through the environment."""
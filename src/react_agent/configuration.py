@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import json
+import os
 from dataclasses import dataclass, field, fields
-from typing import Annotated, Optional
+from functools import lru_cache
+from typing import Annotated, Any, Optional
 
 from langchain_core.runnables import RunnableConfig, ensure_config
 
@@ -23,13 +26,46 @@ class Configuration:
     )
 
     model: Annotated[str, {"__template_metadata__": {"kind": "llm"}}] = field(
-        default="anthropic/claude-3-5-sonnet-20240620",
+        default="openai/gpt-4o",
         metadata={
             "description": "The name of the language model to use for the agent's main interactions. "
             "Should be in the form: provider/model-name."
         },
     )
 
+    fallback_models: list[str] = field(
+        default_factory=lambda: [
+            "anthropic/claude-3-5-sonnet-20240620",
+            "fireworks/accounts/fireworks/models/llama-v3p1-70b-instruct",
+        ],
+        metadata={
+            "description": "Models tried in order when the main model fails or its provider's "
+            "circuit breaker is open. Each should be in the form: provider/model-name."
+        },
+    )
+
+    model_timeout_s: float = field(
+        default=60.0,
+        metadata={"description": "Timeout of a single model request, in seconds."},
+    )
+
+    model_slow_call_s: float = field(
+        default=0.0,
+        metadata={
+            "description": "Model calls slower than this count as slow for the provider's "
+            "circuit breaker. 0 uses 90% of model_timeout_s, so long generations do not "
+            "trip it."
+        },
+    )
+
+    model_max_retries: int = field(
+        default=2,
+        metadata={
+            "description": "Retries per model before failing over to the next one, "
+            "within the provider's retry budget."
+        },
+    )
+
     max_search_results: int = field(
         default=10,
         metadata={
@@ -37,6 +73,140 @@ class Configuration:
         },
     )
 
+    max_developer: int = field(
+        default=3,
+        metadata={
+            "description": "Number of developers to create when the input does not set max_developer."
+        },
+    )
+
+    requirements_mode: str = field(
+        default="single",
+        metadata={
+            "description": "How process_requirements works: 'single' writes all requirements in "
+            "one generation; 'expanded' lists requirement headlines first, then expands every "
+            "headline into a structured requirement in parallel."
+        },
+    )
+
+    max_requirements: int = field(
+        default=5,
+        metadata={
+            "description": "Maximum number of requirement headlines expanded in 'expanded' mode."
+        },
+    )
+
+    max_num_turns: int = field(
+        default=2,
+        metadata={
+            "description": "Maximum number of expert answers per interview when the interview "
+            "state does not set max_num_turns."
+        },
+    )
+
+    web_search_max_results: int = field(
+        default=3,
+        metadata={
+            "description": "Number of Tavily results retrieved per interview question."
+        },
+    )
+
+    wikipedia_max_docs: int = field(
+        default=2,
+        metadata={
+            "description": "Number of Wikipedia documents loaded per interview question. "
+            "0 skips the Wikipedia search, including its query generation."
+        },
+    )
+
+    tuning_profile: str = field(
+        default="",
+        metadata={
+            "description": "Path of a JSON profile written by react_agent.autotune. Its parameters "
+            "are used as defaults; values set in the configurable dict take precedence."
+        },
+    )
+
+    interview_workers: int = field(
+        default=0,
+        metadata={
+            "description": "Number of worker processes used to run the interview subgraphs. "
+            "0 runs every interview in-process through the Send() API."
+        },
+    )
+
+    interview_queue_path: str = field(
+        default="interview_queue.sqlite",
+        metadata={
+            "description": "Path of the SQLite job queue shared by the interview workers."
+        },
+    )
+
+    interview_max_attempts: int = field(
+        default=3,
+        metadata={
+            "description": "How many times an interview job is attempted before it is marked as failed."
+        },
+    )
+
+    interview_lease_seconds: float = field(
+        default=900.0,
+        metadata={
+            "description": "How long a worker holds an interview job before another worker may "
+            "claim it again. Set it above the longest expected interview, or it runs twice."
+        },
+    )
+
+    interview_cache_path: str = field(
+        default="",
+        metadata={
+            "description": "Path of a SQLite cache of completed interviews. Developers whose persona, "
+            "topic, models and interview settings are unchanged reuse their stored interview "
+            "instead of being interviewed again. Empty disables the cache."
+        },
+    )
+
+    interview_novelty_threshold: float = field(
+        default=0.2,
+        metadata={
+            "description": "End an interview once the share of new word shingles in the "
+            "latest expert answer falls below this value. 0 disables early stopping. Answers "
+            "are compared from the second one on, so this only saves turns when "
+            "max_num_turns is 3 or more."
+        },
+    )
+
+    developer_similarity_threshold: float = field(
+        default=0.5,
+        metadata={
+            "description": "Developers whose role and description reach this word-bigram Jaccard "
+            "similarity are merged before interviews start. 1 effectively disables merging."
+        },
+    )
+
+    profile_memory: bool = field(
+        default=False,
+        metadata={
+            "description": "Record tracemalloc readings and the serialized size of every "
+            "state key after each node of the main and interview graphs."
+        },
+    )
+
+    profile_path: str = field(
+        default="profiles/timeline.jsonl",
+        metadata={
+            "description": "JSON-lines file the memory profiling timeline is appended to."
+        },
+    )
+
+    profile_cprofile_dir: str = field(
+        default="",
+        metadata={
+            "description": "When set (and profile_memory is on), dump a cProfile file per node "
+            "execution to this directory."
+        },
+    )
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
@@ -44,5 +214,19 @@ class Configuration:
         """Create a Configuration instance from a RunnableConfig object."""
         config = ensure_config(config)
         configurable = config.get("configurable") or {}
+        profile_path = configurable.get("tuning_profile")
+        if profile_path:
+            configurable = {**load_profile(profile_path), **configurable}
         _fields = {f.name for f in fields(cls) if f.init}
         return cls(**{k: v for k, v in configurable.items() if k in _fields})
+
+
+def load_profile(path: str) -> dict[str, Any]:
+    """Load the parameters of a tuning profile, re-reading it when the file changes."""
+    return _read_profile(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=8)
+def _read_profile(path: str, mtime: float) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return dict(json.load(f)["parameters"])
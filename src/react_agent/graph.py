@@ -26,8 +26,11 @@ from node import (
     route_messages,
     write_section,
     create_developers,
+    deduplicate_developers,
     human_feedback,
     initiate_all_interviews,
+    conduct_interview_pool,
+    reuse_interview,
     dependencies,
     backend_end,
     front_end,
@@ -35,6 +38,7 @@ from node import (
     process_requirements,
     human_feedback_for_requirements,
 )
+from react_agent.profiling import profiled
 
 ### Build Interview Graph
 
@@ -50,12 +54,12 @@ from node import (
 
 interview_builder = StateGraph(InterviewState)
 
-interview_builder.add_node("ask_question", generate_question)
-interview_builder.add_node("search_web", search_web)
-interview_builder.add_node("search_wikipedia", search_wikipedia)
-interview_builder.add_node("answer_question", generate_answer)
-interview_builder.add_node("save_interview", save_interview)
-interview_builder.add_node("write_section", write_section)
+interview_builder.add_node("ask_question", profiled(generate_question))
+interview_builder.add_node("search_web", profiled(search_web))
+interview_builder.add_node("search_wikipedia", profiled(search_wikipedia))
+interview_builder.add_node("answer_question", profiled(generate_answer))
+interview_builder.add_node("save_interview", profiled(save_interview))
+interview_builder.add_node("write_section", profiled(write_section))
 
 # Flow
 interview_builder.add_edge(START, "ask_question")
@@ -76,18 +80,21 @@ compiled_interview_graph = interview_builder.compile()
 ### Build Main Graph
 
 builder = StateGraph(ResearchGraphState)
-builder.add_node("create_developer", create_developers)
+builder.add_node("create_developer", profiled(create_developers))
+builder.add_node("deduplicate_developers", profiled(deduplicate_developers))
 
-builder.add_node("process_requirements", process_requirements)
+builder.add_node("process_requirements", profiled(process_requirements))
 
-builder.add_node("human_feedback_for_requirements", human_feedback_for_requirements)
+builder.add_node("human_feedback_for_requirements", profiled(human_feedback_for_requirements))
 
-builder.add_node("human_feedback", human_feedback)
+builder.add_node("human_feedback", profiled(human_feedback))
 builder.add_node("conduct_interview", compiled_interview_graph)
-builder.add_node("dependencies", dependencies)
-builder.add_node("backend_end", backend_end)
-builder.add_node("front_end", front_end)
-builder.add_node("finalize_report", finalize_report)
+builder.add_node("conduct_interview_pool", profiled(conduct_interview_pool))
+builder.add_node("reuse_interview", profiled(reuse_interview))
+builder.add_node("dependencies", profiled(dependencies))
+builder.add_node("backend_end", profiled(backend_end))
+builder.add_node("front_end", profiled(front_end))
+builder.add_node("finalize_report", profiled(finalize_report))
 
 # Logic
 builder.add_edge(START,"process_requirements")
@@ -98,15 +105,17 @@ builder.add_conditional_edges(
     ["process_requirements", "create_developer"]
 )
 
-builder.add_edge("create_developer", "human_feedback")
+builder.add_edge("create_developer", "deduplicate_developers")
+builder.add_edge("deduplicate_developers", "human_feedback")
 builder.add_conditional_edges(
     "human_feedback", 
     initiate_all_interviews, 
-    ["create_developer", "conduct_interview"]
+    ["create_developer", "conduct_interview", "conduct_interview_pool", "reuse_interview"]
 )
-builder.add_edge("conduct_interview", "dependencies")
-builder.add_edge("conduct_interview", "backend_end")
-builder.add_edge("conduct_interview", "front_end")
+for interviews in ["conduct_interview", "conduct_interview_pool", "reuse_interview"]:
+    builder.add_edge(interviews, "dependencies")
+    builder.add_edge(interviews, "backend_end")
+    builder.add_edge(interviews, "front_end")
 builder.add_edge(
     ["front_end", "dependencies", "backend_end"], 
     "finalize_report"
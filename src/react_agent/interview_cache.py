@@ -0,0 +1,100 @@
+"""Reuse completed interviews across feedback iterations and runs.
+
+An interview's outcome depends on the developer, the topic, the models and
+the interview settings and prompts. ``interview_fingerprint`` hashes exactly
+these, so when a reviewer's feedback regenerates the developers, only the
+new or changed personas are interviewed again. The others reuse the
+``sections``, ``interview`` and ``context`` stored by ``InterviewCache`` when
+their interview first completed.
+
+The cache is a SQLite database at ``Configuration.interview_cache_path``
+(disabled when empty) and can be shared by the interview worker processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Optional
+
+from react_agent import prompts
+from react_agent.configuration import Configuration
+from react_agent.schemas import developer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    fingerprint TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+INTERVIEW_SETTINGS = (
+    "model",
+    "fallback_models",
+    "max_num_turns",
+    "web_search_max_results",
+    "wikipedia_max_docs",
+    "interview_novelty_threshold",
+)
+"""Configuration fields that change the outcome of an interview."""
+
+
+def interview_fingerprint(
+    persona: developer, topic: str, configuration: Configuration
+) -> str:
+    """Return a stable key for the interview of ``persona`` on ``topic``."""
+    key = {
+        "developer": persona.model_dump(),
+        "topic": topic,
+        "settings": {name: getattr(configuration, name) for name in INTERVIEW_SETTINGS},
+        "prompts": [
+            prompts.question_instructions,
+            prompts.search_instructions,
+            prompts.answer_instructions,
+            prompts.section_writer_instructions,
+        ],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class InterviewCache:
+    """Completed interviews stored in a local SQLite database, by fingerprint."""
+
+    def __init__(self, path: str) -> None:
+        """Open (and create if needed) the cache stored at ``path``."""
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self._conn.close()
+
+    def get(self, fingerprint: str) -> Optional[dict[str, Any]]:
+        """Return the stored result of an interview, if any."""
+        row = self._conn.execute(
+            "SELECT result FROM interviews WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, fingerprint: str, result: dict[str, Any]) -> None:
+        """Store the ``sections``, ``interview`` and ``context`` of an interview."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO interviews (fingerprint, result, created) "
+            "VALUES (?, ?, ?)",
+            (
+                fingerprint,
+                json.dumps(
+                    {
+                        "sections": result.get("sections", []),
+                        "interview": result.get("interview", ""),
+                        "context": result.get("context", []),
+                    }
+                ),
+                time.time(),
+            ),
+        )
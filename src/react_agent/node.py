@@ -1,3 +1,4 @@
+import logging
 import operator
 from pydantic import BaseModel, Field
 from typing import Annotated, List
@@ -6,34 +7,46 @@ from typing_extensions import TypedDict
 from langchain_community.document_loaders import WikipediaLoader
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, get_buffer_string
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableConfig
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from prompts import process_instructions,developer_instructions,question_instructions,search_instructions,answer_instructions,section_writer_instructions,report_writer_instructions,intro_conclusion_instructions # or other imports
+from prompts import process_instructions,requirement_headlines_instructions,requirement_expansion_instructions,developer_instructions,question_instructions,search_instructions,answer_instructions,section_writer_instructions,report_writer_instructions,intro_conclusion_instructions # or other imports
 from langgraph.constants import Send
-from schemas import functional_requirement,developer, Perspectives, SearchQuery, GenerateDeveloperState, InterviewState, ResearchGraphState
+from schemas import functional_requirement,requirement,RequirementHeadlines,developer, Perspectives, SearchQuery, GenerateDeveloperState, InterviewState, ResearchGraphState
     
 from langgraph.graph import END, MessagesState, START, StateGraph
 
+from react_agent.cassette import cassette, decode_documents, encode_documents
+from react_agent.configuration import Configuration
+from react_agent.interview_cache import InterviewCache, interview_fingerprint
+from react_agent.resilience import FailoverChatModel
+from react_agent.utils import cluster_similar, get_message_text, novelty, search_cache
+from react_agent.workers import InterviewWorkerPool
 
-llm = ChatOpenAI(model="gpt-4o", temperature=0)
+logger = logging.getLogger(__name__)
+
+llm = FailoverChatModel(temperature=0, cache=cassette.llm_cache)
 
 ### Function Definitions
 
 
 
-def process_requirements(state: GenerateDeveloperState):
+def process_requirements(state: GenerateDeveloperState, config: RunnableConfig):
     
     
     
     """Process requirements"""
+    configuration = Configuration.from_runnable_config(config)
     topic = state['topic']
-    max_developer = state['max_developer']
+    max_developer = state.get('max_developer', configuration.max_developer)
 
     human_developer_feedback = state.get('human_developer_feedback', '')
 
+    if configuration.requirements_mode == "expanded":
+        return expand_requirements(topic, human_developer_feedback, configuration)
+
     # Enforce structured output
     structured_llm = llm.with_structured_output(functional_requirement)
 
@@ -54,15 +67,52 @@ def process_requirements(state: GenerateDeveloperState):
     # Write the list of developers to state
     return {"requirements": requirements.requirements}
 
+def expand_requirements(topic: str, human_developer_feedback: str, configuration: Configuration):
+    """List requirement headlines, then expand them into structured requirements in parallel"""
+    # A short generation for the headlines
+    structured_llm = llm.with_structured_output(RequirementHeadlines)
+    system_message = requirement_headlines_instructions.format(
+        topic=topic,
+        human_developer_feedback=human_developer_feedback,
+        max_requirements=configuration.max_requirements
+    )
+    headlines = structured_llm.invoke([
+        SystemMessage(content=system_message),
+        HumanMessage(content="List the requirement headlines.")
+    ]).headlines[:configuration.max_requirements]
+
+    # One concurrent generation per headline
+    listing = "\n".join(f"- {headline}" for headline in headlines)
+    structured_llm = llm.with_structured_output(requirement)
+    details = structured_llm.batch([
+        [
+            SystemMessage(content=requirement_expansion_instructions.format(
+                topic=topic,
+                human_developer_feedback=human_developer_feedback,
+                headlines=listing,
+                headline=headline
+            )),
+            HumanMessage(content="Detail the requirement.")
+        ]
+        for headline in headlines
+    ])
+
+    requirements = "\n".join(
+        f"{number}. {headline}\n{detail.summary}"
+        for number, (headline, detail) in enumerate(zip(headlines, details), start=1)
+    )
+    return {"requirements": requirements, "requirement_details": details}
+
     
     
     
     
 
-def create_developers(state: GenerateDeveloperState):
+def create_developers(state: GenerateDeveloperState, config: RunnableConfig):
     """Create developers"""
+    configuration = Configuration.from_runnable_config(config)
     topic = state['topic']
-    max_developer = state['max_developer']
+    max_developer = state.get('max_developer', configuration.max_developer)
     human_developer_feedback = state.get('human_developer_feedback', '')
         
     # Enforce structured output
@@ -84,6 +134,43 @@ def create_developers(state: GenerateDeveloperState):
     # Write the list of developers to state
     return {"developers": developers.developers}
 
+def deduplicate_developers(state: GenerateDeveloperState, config: RunnableConfig):
+    """Merge near-duplicate developers before they are interviewed"""
+    developers = state["developers"]
+    configuration = Configuration.from_runnable_config(config)
+
+    # Cluster developers on what they will ask about; names and affiliations always differ
+    clusters = cluster_similar(
+        [f"{candidate.role}\n{candidate.description}" for candidate in developers],
+        configuration.developer_similarity_threshold
+    )
+
+    # Keep the first developer of each cluster and report the merged ones
+    lines = []
+    for cluster in clusters:
+        kept = developers[cluster[0][0]]
+        for i, similarity in cluster[1:]:
+            merged = developers[i]
+            lines.append(
+                f"- Merged {merged.name} ({merged.role}) into {kept.name} ({kept.role}), "
+                f"similarity {similarity:.2f}"
+            )
+
+    # Each interview turn asks, writes two search queries and answers; then a section is written
+    avoided = len(developers) - len(clusters)
+    turns = configuration.max_num_turns
+    lines.append(
+        f"Interviews avoided: {avoided} "
+        f"(~{avoided * (4 * turns + 1)} LLM calls, ~{avoided * 2 * turns} search calls)"
+    )
+    if avoided:
+        logger.info("Merged %d near-duplicate developer(s)", avoided)
+
+    return {
+        "developers": [developers[cluster[0][0]] for cluster in clusters],
+        "developer_merge_report": "\n".join(lines),
+    }
+
 def human_feedback_for_requirements(state: GenerateDeveloperState):
     """No-op node that should be interrupted on"""
     pass
@@ -104,9 +191,10 @@ def generate_question(state: InterviewState):
     # Write messages to state
     return {"messages": [question]}
 
-def search_web(state: InterviewState):
+def search_web(state: InterviewState, config: RunnableConfig):
     """Retrieve documents from web search"""
-    tavily_search = TavilySearchResults(max_results=3)
+    configuration = Configuration.from_runnable_config(config)
+    max_results = configuration.web_search_max_results
 
     # Search query
     structured_llm = llm.with_structured_output(SearchQuery)
@@ -115,7 +203,18 @@ def search_web(state: InterviewState):
     )
     
     # Search
-    search_docs = tavily_search.invoke(search_query.search_query)
+    request = {"query": search_query.search_query, "max_results": max_results}
+    search_docs = search_cache.get_or_set(
+        ("tavily", request["query"], request["max_results"]),
+        lambda: cassette.call(
+            "tavily",
+            request,
+            # Built here: the tool needs TAVILY_API_KEY, which a replay does not
+            lambda: TavilySearchResults(max_results=max_results).invoke(
+                search_query.search_query
+            )
+        )
+    )
 
     # Format
     formatted_search_docs = "\n\n---\n\n".join([
@@ -125,18 +224,34 @@ def search_web(state: InterviewState):
 
     return {"context": [formatted_search_docs]} 
 
-def search_wikipedia(state: InterviewState):
+def search_wikipedia(state: InterviewState, config: RunnableConfig):
     """Retrieve documents from Wikipedia"""
+    configuration = Configuration.from_runnable_config(config)
+    load_max_docs = configuration.wikipedia_max_docs
+    # Wikipedia is switched off: skip the query generation and the search
+    if load_max_docs == 0:
+        return {"context": []}
+
     structured_llm = llm.with_structured_output(SearchQuery)
     search_query = structured_llm.invoke(
         [SystemMessage(content=search_instructions)] + state['messages']
     )
     
     # Search
-    search_docs = WikipediaLoader(
-        query=search_query.search_query, 
-        load_max_docs=2
-    ).load()
+    request = {"query": search_query.search_query, "load_max_docs": load_max_docs}
+    search_docs = search_cache.get_or_set(
+        ("wikipedia", request["query"], request["load_max_docs"]),
+        lambda: cassette.call(
+            "wikipedia",
+            request,
+            lambda: WikipediaLoader(
+                query=search_query.search_query, 
+                load_max_docs=load_max_docs
+            ).load(),
+            encode=encode_documents,
+            decode=decode_documents
+        )
+    )
 
     # Format
     formatted_search_docs = "\n\n---\n\n".join([
@@ -171,10 +286,11 @@ def save_interview(state: InterviewState):
     interview = get_buffer_string(messages)
     return {"interview": interview}
 
-def route_messages(state: InterviewState, name: str = "expert"):
+def route_messages(state: InterviewState, config: RunnableConfig, name: str = "expert"):
     """Route between question and answer"""
     messages = state["messages"]
-    max_num_turns = state.get('max_num_turns', 2)
+    configuration = Configuration.from_runnable_config(config)
+    max_num_turns = state.get('max_num_turns', configuration.max_num_turns)
 
     # Check the number of expert answers 
     num_responses = len([
@@ -190,9 +306,31 @@ def route_messages(state: InterviewState, name: str = "expert"):
     
     if "Thank you so much for your help" in last_question.content:
         return 'save_interview'
+
+    # End early once the last answer mostly repeats the interview so far. The first
+    # answer has nothing to repeat, so this only cuts interviews of 3+ turns short.
+    if num_responses > 1:
+        score = novelty(
+            get_message_text(messages[-1]),
+            [get_message_text(m) for m in messages[:-1]]
+        )
+        if score < configuration.interview_novelty_threshold:
+            turns_saved = max_num_turns - num_responses
+            tokens_so_far = sum(
+                (m.usage_metadata or {}).get("total_tokens", 0)
+                for m in messages if isinstance(m, AIMessage)
+            )
+            logger.info(
+                "Ending interview early (novelty %.2f < %.2f): saved %d turn(s), ~%d tokens",
+                score,
+                configuration.interview_novelty_threshold,
+                turns_saved,
+                tokens_so_far // num_responses * turns_saved,
+            )
+            return 'save_interview'
     return "ask_question"
 
-def write_section(state: InterviewState):
+def write_section(state: InterviewState, config: RunnableConfig):
     """Node to write a section"""
     interview = state["interview"]
     context = state["context"]
@@ -203,21 +341,91 @@ def write_section(state: InterviewState):
         SystemMessage(content=system_message),
         HumanMessage(content=f"Use this source to write your section: {context}")
     ]) 
+
+    # Remember the finished interview for the next feedback iteration or run
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.interview_cache_path and state.get("fingerprint"):
+        cache = InterviewCache(configuration.interview_cache_path)
+        try:
+            cache.put(state["fingerprint"], {
+                "sections": [section.content],
+                "interview": interview,
+                "context": context,
+            })
+        finally:
+            cache.close()
                 
     # Append it to state
     return {"sections": [section.content]}
 
-def initiate_all_interviews(state: ResearchGraphState):
+def interview_payloads(state: ResearchGraphState, config: RunnableConfig):
+    """Build the conduct_interview input for every developer"""
+    topic = state["topic"]
+    configuration = Configuration.from_runnable_config(config)
+    return [{
+        "developer": persona,
+        "messages": [HumanMessage(content=f"So you said you were writing an article on {topic}?")],
+        "fingerprint": interview_fingerprint(persona, topic, configuration),
+    } for persona in state["developers"]]
+
+def cached_interviews(payloads: list, config: RunnableConfig):
+    """Look up the stored result of every payload, None when it must be interviewed"""
+    configuration = Configuration.from_runnable_config(config)
+    if not configuration.interview_cache_path:
+        return [None] * len(payloads)
+    cache = InterviewCache(configuration.interview_cache_path)
+    try:
+        results = [cache.get(payload["fingerprint"]) for payload in payloads]
+    finally:
+        cache.close()
+    logger.info(
+        "Reusing %d of %d interview(s) from %s",
+        sum(result is not None for result in results),
+        len(payloads),
+        configuration.interview_cache_path,
+    )
+    return results
+
+def reuse_interview(state: ResearchGraphState):
+    """Node to contribute the sections of a stored interview"""
+    return {"sections": state["sections"]}
+
+def initiate_all_interviews(state: ResearchGraphState, config: RunnableConfig):
     """Conditional edge to initiate all interviews via Send() API or return to create_developer"""    
     human_developer_feedback = state.get('human_developer_feedback', 'approve')
     if human_developer_feedback.lower() != 'approve':
         return "create_developer"
     else:
-        topic = state["topic"]
-        return [Send("conduct_interview", {
-            "developer": developer,
-            "messages": [HumanMessage(content=f"So you said you were writing an article on {topic}?")]
-        }) for developer in state["developers"]]
+        configuration = Configuration.from_runnable_config(config)
+        # Hand the whole batch to the worker pool instead of fanning out in-process
+        if configuration.interview_workers > 0:
+            return "conduct_interview_pool"
+        payloads = interview_payloads(state, config)
+        return [
+            Send("conduct_interview", payload) if cached is None
+            else Send("reuse_interview", {"sections": cached["sections"]})
+            for payload, cached in zip(payloads, cached_interviews(payloads, config))
+        ]
+
+def conduct_interview_pool(state: ResearchGraphState, config: RunnableConfig):
+    """Run all interviews on a pool of worker processes"""
+    configuration = Configuration.from_runnable_config(config)
+    pool = InterviewWorkerPool(
+        configuration.interview_workers,
+        configuration.interview_queue_path,
+        max_attempts=configuration.interview_max_attempts,
+        lease_seconds=configuration.interview_lease_seconds,
+    )
+    payloads = interview_payloads(state, config)
+    cached = cached_interviews(payloads, config)
+    fresh = iter(pool.run(
+        [payload for payload, result in zip(payloads, cached) if result is None],
+        configuration,
+    ))
+    results = [result if result is not None else next(fresh) for result in cached]
+
+    # Collect the sections in developer order, as the Send() fan-out would
+    return {"sections": [section for result in results for section in result["sections"]]}
 
 def dependencies(state: ResearchGraphState):
     """Node to write the final report body"""
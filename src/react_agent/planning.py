@@ -0,0 +1,305 @@
+"""Estimate the cost of a run from the compiled graph topology, before starting it.
+
+``plan_run`` walks the nodes and edges of a compiled graph (recursing into
+subgraph nodes such as ``conduct_interview``) and multiplies per-node profiles
+by how often each node runs:
+
+- Back edges (the interview question/answer loop, the human feedback loops)
+  are found with a depth-first search; every node of a loop body runs once per
+  iteration (``max_num_turns`` for the interview loop, ``feedback_rounds`` for
+  the others).
+- Nodes fed by ``Send()`` run once per developer, in waves of at most
+  ``interview_workers`` when the worker pool is used.
+- Of alternative branches, only the one the configuration selects is counted.
+- With ``requirements_mode="expanded"``, ``process_requirements`` makes one
+  headline call and then ``max_requirements`` expansion calls in parallel.
+
+Per-node profiles give the external calls a node makes; their latency and
+tokens come from ``CallCost`` (averages from a cassette) or from measured
+node wall times (a ``react_agent.profiling`` timeline). ``admit`` and
+``reshape`` turn a plan into an admission decision.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional, Sequence
+
+from langgraph.graph import END, START
+from langgraph.pregel import Pregel
+
+from react_agent.autotune import CallSamples
+from react_agent.configuration import Configuration
+
+
+@dataclass(frozen=True)
+class NodeProfile:
+    """External calls made by one execution of a node."""
+
+    llm_calls: int = 0
+    search_calls: int = 0
+    latency_s: Optional[float] = None
+    """Measured latency of one execution; derived from ``CallCost`` when unset."""
+    tokens: Optional[float] = None
+    """Measured tokens of one execution; derived from ``CallCost`` when unset."""
+    concurrency: int = 1
+    """Most calls in flight at once during one execution."""
+
+
+NODE_PROFILES: dict[str, NodeProfile] = {
+    "process_requirements": NodeProfile(llm_calls=1),
+    "create_developer": NodeProfile(llm_calls=1),
+    "ask_question": NodeProfile(llm_calls=1),
+    "search_web": NodeProfile(llm_calls=1, search_calls=1),
+    "search_wikipedia": NodeProfile(llm_calls=1, search_calls=1),
+    "answer_question": NodeProfile(llm_calls=1),
+    "write_section": NodeProfile(llm_calls=1),
+    "dependencies": NodeProfile(llm_calls=1),
+    "backend_end": NodeProfile(llm_calls=1),
+    "front_end": NodeProfile(llm_calls=1),
+}
+"""Calls made by the research graph's nodes; unlisted nodes make none."""
+
+LOOP_PARAMETERS: dict[str, str] = {"ask_question": "max_num_turns"}
+"""Configuration field giving the iterations of a loop, by loop head."""
+
+FANOUT_PARAMETERS: dict[str, str] = {"conduct_interview": "max_developer"}
+"""Configuration field giving the number of Send() tasks, by target node."""
+
+
+@dataclass(frozen=True)
+class CallCost:
+    """Average latency and size of a single external call."""
+
+    llm_latency_s: float = 4.0
+    llm_tokens: float = 1500.0
+    search_latency_s: float = 1.5
+
+    @classmethod
+    def from_samples(cls, samples: CallSamples) -> CallCost:
+        """Average the samples collected by ``CallSamples.from_cassette``."""
+
+        def mean(values: Sequence[float]) -> float:
+            return sum(values) / len(values)
+
+        return cls(
+            llm_latency_s=mean(samples.llm_latency),
+            llm_tokens=mean(samples.llm_tokens),
+            search_latency_s=mean(samples.web_latency + samples.wikipedia_latency),
+        )
+
+
+@dataclass
+class RunPlan:
+    """Estimated cost of a run."""
+
+    llm_calls: float = 0.0
+    search_calls: float = 0.0
+    tokens: float = 0.0
+    critical_path_s: float = 0.0
+    peak_concurrency: int = 0
+    executions: dict[str, float] = field(default_factory=dict)
+    """Expected executions of every node, subgraph nodes prefixed by their parent."""
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Admission limits for a run; ``None`` leaves a dimension unbounded."""
+
+    max_llm_calls: Optional[float] = None
+    max_tokens: Optional[float] = None
+    max_latency_s: Optional[float] = None
+    max_concurrency: Optional[int] = None
+
+
+def profiles_from_timeline(records: list[dict[str, Any]]) -> dict[str, NodeProfile]:
+    """Build node profiles with measured latencies from a profiling timeline."""
+    walls: dict[str, list[float]] = defaultdict(list)
+    for record in records:
+        walls[record["node"]].append(record["wall_s"])
+    return {
+        node: replace(NODE_PROFILES.get(node, NodeProfile()), latency_s=sum(w) / len(w))
+        for node, w in walls.items()
+    }
+
+
+def _back_edges(adjacency: dict[str, list[str]]) -> set[tuple[str, str]]:
+    back, state = set(), {}
+
+    def visit(node: str) -> None:
+        state[node] = "open"
+        for target in adjacency[node]:
+            if state.get(target) == "open":
+                back.add((node, target))
+            elif target not in state:
+                visit(target)
+        state[node] = "done"
+
+    visit(START)
+    return back
+
+
+def _reachable(adjacency: dict[str, list[str]], start: str) -> set[str]:
+    seen, stack = {start}, [start]
+    while stack:
+        for target in adjacency[stack.pop()]:
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+def plan_run(
+    graph: Any,
+    configuration: Optional[Configuration] = None,
+    *,
+    cost: Optional[CallCost] = None,
+    profiles: Optional[dict[str, NodeProfile]] = None,
+    feedback_rounds: int = 1,
+) -> RunPlan:
+    """Estimate calls, tokens, critical-path latency and peak concurrency of a run."""
+    configuration = configuration or Configuration()
+    cost = cost or CallCost()
+    profiles = {**NODE_PROFILES, **(profiles or {})}
+    if configuration.wikipedia_max_docs == 0:
+        # search_wikipedia returns without calling anything
+        profiles["search_wikipedia"] = NodeProfile()
+    if configuration.requirements_mode == "expanded":
+        # Headlines, then every expansion in parallel: two calls on the path
+        requirements = profiles["process_requirements"]
+        latency = requirements.latency_s
+        profiles["process_requirements"] = replace(
+            requirements,
+            llm_calls=1 + configuration.max_requirements,
+            latency_s=2 * cost.llm_latency_s if latency is None else latency,
+            concurrency=configuration.max_requirements,
+        )
+    # The worker pool runs the same interview subgraph out of process
+    skip = {"conduct_interview_pool"}
+
+    def plan(compiled: Any, prefix: str) -> RunPlan:
+        drawable = compiled.get_graph()
+        adjacency: dict[str, list[str]] = defaultdict(list)
+        for edge in drawable.edges:
+            if edge.source not in skip and edge.target not in skip:
+                adjacency[edge.source].append(edge.target)
+        back = _back_edges(adjacency)
+        dag: dict[str, list[str]] = defaultdict(list)
+        for source, targets in adjacency.items():
+            dag[source] = [t for t in targets if (source, t) not in back]
+
+        # Nodes of a loop body run once per iteration
+        iterations: dict[str, int] = defaultdict(lambda: 1)
+        for tail, head in back:
+            parameter = LOOP_PARAMETERS.get(head)
+            rounds = getattr(configuration, parameter) if parameter else feedback_rounds
+            body = {
+                node for node in _reachable(dag, head) if tail in _reachable(dag, node)
+            }
+            for node in body:
+                iterations[node] *= rounds
+
+        result = RunPlan()
+        weight: dict[str, float] = {}
+        width: dict[str, int] = {}
+        for node_id, node in drawable.nodes.items():
+            if node_id in (START, END) or node_id in skip:
+                continue
+            runs = iterations[node_id]
+            if isinstance(node.data, Pregel):
+                parameter = FANOUT_PARAMETERS.get(node_id)
+                tasks = getattr(configuration, parameter) if parameter else 1
+                concurrency = tasks
+                if configuration.interview_workers > 0:
+                    concurrency = min(tasks, configuration.interview_workers)
+                sub = plan(node.data, f"{prefix}{node_id}/")
+                result.llm_calls += sub.llm_calls * tasks * runs
+                result.search_calls += sub.search_calls * tasks * runs
+                result.tokens += sub.tokens * tasks * runs
+                for name, count in sub.executions.items():
+                    result.executions[name] = count * tasks * runs
+                result.executions[f"{prefix}{node_id}"] = tasks * runs
+                waves = math.ceil(tasks / concurrency) if concurrency else 0
+                weight[node_id] = sub.critical_path_s * waves * runs
+                width[node_id] = sub.peak_concurrency * concurrency
+            else:
+                profile = profiles.get(node_id, NodeProfile())
+                latency = profile.latency_s
+                if latency is None:
+                    latency = (
+                        profile.llm_calls * cost.llm_latency_s
+                        + profile.search_calls * cost.search_latency_s
+                    )
+                tokens = profile.tokens
+                if tokens is None:
+                    tokens = profile.llm_calls * cost.llm_tokens
+                result.llm_calls += profile.llm_calls * runs
+                result.search_calls += profile.search_calls * runs
+                result.tokens += tokens * runs
+                weight[node_id] = latency * runs
+                calls = profile.llm_calls or profile.search_calls
+                width[node_id] = profile.concurrency if calls else 0
+                result.executions[f"{prefix}{node_id}"] = runs
+
+        # Longest weighted path, and the superstep level of every node
+        finish: dict[str, float] = {}
+        level: dict[str, int] = {}
+
+        def longest(node: str) -> tuple[float, int]:
+            if node not in finish:
+                parents = [s for s, targets in dag.items() if node in targets]
+                starts = [longest(p) for p in parents]
+                finish[node] = max((s[0] for s in starts), default=0.0) + weight.get(
+                    node, 0.0
+                )
+                level[node] = max((s[1] for s in starts), default=-1) + 1
+            return finish[node], level[node]
+
+        result.critical_path_s = longest(END)[0]
+        by_level: dict[int, int] = defaultdict(int)
+        for node_id in weight:
+            longest(node_id)
+            by_level[level[node_id]] += width[node_id]
+        result.peak_concurrency = max(by_level.values(), default=0)
+        return result
+
+    return plan(graph, "")
+
+
+def admit(plan: RunPlan, limits: Limits) -> list[str]:
+    """Return the limits a planned run would exceed; an empty list admits it."""
+    checks = [
+        ("LLM calls", plan.llm_calls, limits.max_llm_calls),
+        ("tokens", plan.tokens, limits.max_tokens),
+        ("critical path (s)", plan.critical_path_s, limits.max_latency_s),
+        ("peak concurrency", plan.peak_concurrency, limits.max_concurrency),
+    ]
+    return [
+        f"{name}: {value:.0f} > {limit:.0f}"
+        for name, value, limit in checks
+        if limit is not None and value > limit
+    ]
+
+
+def reshape(
+    graph: Any,
+    configuration: Configuration,
+    limits: Limits,
+    **plan_kwargs: Any,
+) -> Optional[Configuration]:
+    """Shrink a run until it is admitted, or return ``None`` if it never is.
+
+    Interview turns are reduced first, then the number of developers.
+    """
+    candidate = configuration
+    while True:
+        if not admit(plan_run(graph, candidate, **plan_kwargs), limits):
+            return candidate
+        if candidate.max_num_turns > 1:
+            candidate = replace(candidate, max_num_turns=candidate.max_num_turns - 1)
+        elif candidate.max_developer > 1:
+            candidate = replace(candidate, max_developer=candidate.max_developer - 1)
+        else:
+            return None
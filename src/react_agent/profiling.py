@@ -0,0 +1,234 @@
+"""Opt-in memory profiling of the graph nodes.
+
+Nodes wrapped with ``profiled`` append one JSON line per execution to
+``Configuration.profile_path`` when ``Configuration.profile_memory`` is set.
+Each record holds the graph (``""`` for the main graph, ``"conduct_interview"``
+for the interview subgraph), node, superstep, wall time, ``tracemalloc``
+readings and the checkpoint-serialized size of every state key the node saw
+and returned. The state a node receives at step N is the state produced by
+superstep N - 1, so ``superstep_timeline`` rebuilds per-superstep growth.
+
+Tracing runs only while profiled nodes are executing, so later runs without
+``profile_memory`` do not pay for it; ``traced_bytes`` therefore counts what
+is still allocated from the nodes in flight, not the whole process.
+
+Setting ``Configuration.profile_cprofile_dir`` additionally dumps a cProfile
+``.prof`` file per node execution (viewable with snakeviz or flameprof).
+
+Timelines from two versions can be compared with::
+
+    python -m react_agent.profiling before.jsonl after.jsonl
+"""
+
+from __future__ import annotations
+
+import cProfile
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, get_type_hints
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from react_agent.configuration import Configuration
+
+_serde = JsonPlusSerializer()
+_lock = threading.Lock()
+_tracing_lock = threading.Lock()
+_in_flight = 0
+_started_tracing = False
+
+
+def _start_tracing() -> None:
+    global _in_flight, _started_tracing
+    with _tracing_lock:
+        if _in_flight == 0:
+            # Tracing started by someone else is left running
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _in_flight += 1
+
+
+def _stop_tracing() -> None:
+    global _in_flight, _started_tracing
+    with _tracing_lock:
+        _in_flight -= 1
+        if _in_flight == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def serialized_sizes(values: Any) -> dict[str, int]:
+    """Return the checkpoint-serialized size in bytes of every key of a state dict."""
+    if not isinstance(values, dict):
+        return {}
+    return {key: len(_serde.dumps_typed(value)[1]) for key, value in values.items()}
+
+
+def _graph_of(config: RunnableConfig) -> str:
+    # "conduct_interview:<task id>|ask_question:<task id>" -> "conduct_interview"
+    namespace = config.get("metadata", {}).get("langgraph_checkpoint_ns", "")
+    return "|".join(part.split(":")[0] for part in namespace.split("|")[:-1])
+
+
+def profiled(node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a node function so it is profiled when the configuration asks for it."""
+    takes_config = "config" in inspect.signature(node).parameters
+
+    def call(state: Any, config: RunnableConfig) -> Any:
+        return node(state, config=config) if takes_config else node(state)
+
+    def wrapper(state: Any, config: RunnableConfig) -> Any:
+        configuration = Configuration.from_runnable_config(config)
+        if not configuration.profile_memory:
+            return call(state, config)
+
+        metadata = config.get("metadata", {})
+        graph, name = _graph_of(config), metadata.get("langgraph_node", node.__name__)
+        step = metadata.get("langgraph_step")
+
+        profiler = None
+        if configuration.profile_cprofile_dir:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another thread is profiling: one profiler per process on 3.12+
+                profiler = None
+
+        _start_tracing()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            start = time.perf_counter()
+            try:
+                update = call(state, config)
+            finally:
+                wall = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.disable()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            _stop_tracing()
+
+        if profiler is not None:
+            os.makedirs(configuration.profile_cprofile_dir, exist_ok=True)
+            prefix = graph.replace("|", ".") or "main"
+            profiler.dump_stats(
+                os.path.join(
+                    configuration.profile_cprofile_dir,
+                    f"{prefix}.{name}.step{step}.{uuid.uuid4().hex[:8]}.prof",
+                )
+            )
+
+        record = {
+            "ts": time.time(),
+            "graph": graph,
+            "node": name,
+            "step": step,
+            "wall_s": round(wall, 4),
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "traced_delta_bytes": current - before,
+            "state_bytes": serialized_sizes(state),
+            "update_bytes": serialized_sizes(update),
+        }
+        directory = os.path.dirname(configuration.profile_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _lock, open(configuration.profile_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        return update
+
+    # Keep the node's state annotation: the graph infers its input schema from it
+    first = next(iter(inspect.signature(node).parameters))
+    wrapper.__annotations__ = {
+        "state": get_type_hints(node).get(first, Any),
+        "config": RunnableConfig,
+    }
+    wrapper.__name__ = node.__name__
+    wrapper.__doc__ = node.__doc__
+    return wrapper
+
+
+def load_timeline(path: str) -> list[dict[str, Any]]:
+    """Read the records of a profiling timeline."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def superstep_timeline(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Aggregate node records into one entry per (graph, superstep).
+
+    ``state_bytes`` keeps the largest size seen for every key, since parallel
+    interview subgraphs run the same superstep on different states.
+    """
+    steps: dict[tuple[str, int], dict[str, Any]] = {}
+    for record in records:
+        key = (record["graph"], record["step"] or 0)
+        step = steps.setdefault(
+            key,
+            {
+                "graph": key[0],
+                "step": key[1],
+                "nodes": [],
+                "traced_peak_bytes": 0,
+                "state_bytes": {},
+            },
+        )
+        step["nodes"].append(record["node"])
+        step["traced_peak_bytes"] = max(
+            step["traced_peak_bytes"], record["traced_peak_bytes"]
+        )
+        for name, size in record["state_bytes"].items():
+            step["state_bytes"][name] = max(step["state_bytes"].get(name, 0), size)
+    return [steps[key] for key in sorted(steps)]
+
+
+def summarize(records: list[dict[str, Any]]) -> dict[str, dict[str, int]]:
+    """Reduce a timeline to the peak memory and per-key state size of every node."""
+    summary: dict[str, dict[str, int]] = defaultdict(dict)
+    for record in records:
+        node = (
+            f"{record['graph']}/{record['node']}" if record["graph"] else record["node"]
+        )
+        metrics = {
+            "traced_delta_bytes": record["traced_delta_bytes"],
+            **{f"state.{k}": v for k, v in record["state_bytes"].items()},
+            **{f"update.{k}": v for k, v in record["update_bytes"].items()},
+        }
+        for metric, value in metrics.items():
+            summary[node][metric] = max(summary[node].get(metric, value), value)
+    return dict(summary)
+
+
+def diff_timelines(
+    before: list[dict[str, Any]], after: list[dict[str, Any]]
+) -> dict[str, dict[str, tuple[int, int]]]:
+    """Compare two timelines, keeping only the metrics that changed."""
+    old, new = summarize(before), summarize(after)
+    diff: dict[str, dict[str, tuple[int, int]]] = {}
+    for node in sorted(set(old) | set(new)):
+        metrics = set(old.get(node, {})) | set(new.get(node, {}))
+        changes = {
+            metric: (old.get(node, {}).get(metric, 0), new.get(node, {}).get(metric, 0))
+            for metric in sorted(metrics)
+        }
+        changes = {m: values for m, values in changes.items() if values[0] != values[1]}
+        if changes:
+            diff[node] = changes
+    return diff
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m react_agent.profiling BEFORE.jsonl AFTER.jsonl")
+    result = diff_timelines(load_timeline(sys.argv[1]), load_timeline(sys.argv[2]))
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
@@ -1,4 +1,8 @@
 # prompts.py
+SYSTEM_PROMPT = """You are a helpful AI assistant.
+
+System time: {system_time}"""
+
 process_instructions = """You are a system design engineer tasked with analyzing a user's app idea and extracting requirements for a small project.
 
 Follow these instructions carefully:
@@ -26,6 +30,42 @@ If the user provides additional information or clarifications, update the requir
 Stay focused on effectively defining the app within the scope of a small project.
 """
 
+requirement_headlines_instructions = """You are a system design engineer tasked with analyzing a user's app idea for a small project.
+
+1. Review the user's app idea:
+{topic}
+
+2. Examine any additional feedback or notes provided:
+{human_developer_feedback}
+
+3. List at most {max_requirements} functional requirements covering the core features and functionalities needed.
+
+Give every requirement as a short one-line headline only; each one will be detailed separately."""
+
+requirement_expansion_instructions = """You are a system design engineer detailing one functional requirement of a user's app idea for a small project.
+
+The app idea:
+{topic}
+
+Additional feedback or notes:
+{human_developer_feedback}
+
+All requirements of the app, for context:
+{headlines}
+
+Detail only this requirement:
+{headline}
+
+1. Describe the requirement in a few specific bullet points.
+
+2. Provide up to 2 optional suggestions that could enhance it.
+
+3. List the presumptions you make about it.
+
+4. Ask up to 2 clarifying questions about it, most critical first.
+
+Stay concise and within the scope of a small project."""
+
 
 
 developer_instructions = """You are tasked with creating a set of software developer personas. Follow these instructions carefully:
@@ -0,0 +1,345 @@
+"""Resilient access to chat models: circuit breakers, retry budgets and failover.
+
+``FailoverChatModel`` tries ``Configuration.model`` and then every entry of
+``Configuration.fallback_models`` (all ``provider/model`` names loaded with
+``utils.load_chat_model``). Each provider has:
+
+- a ``CircuitBreaker`` that opens when the recent rate of transient errors or
+  share of slow calls gets too high, skips the provider while open, and lets a
+  single probe through after a cooldown;
+- a ``RetryBudget`` that bounds retries to a fraction of the provider's
+  traffic, so retries cannot multiply the load on a struggling endpoint.
+
+Only transient errors (timeouts, connection errors, 429 and 5xx responses, see
+``is_transient``) are retried, fail over and count against a provider. Any
+other error, such as a rejected request, an invalid structured output or a
+``CassetteMiss``, is raised as is. Retries wait with jittered exponential
+backoff. The configuration is read from the runnable config in context, so a
+node calling ``llm.invoke(messages)`` uses the configuration of the run it
+belongs to. ``breaker_metrics`` exposes the state of every breaker.
+
+When the model's cache is a cassette in replay mode, no provider is called:
+models are built with a placeholder API key, and each call is served from the
+recording of the first model in the failover order that has one, so a run
+recorded after a failover replays without keys too.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Optional, cast
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig, ensure_config
+
+from react_agent.cassette import CassetteCache, CassetteMiss
+from react_agent.configuration import Configuration
+from react_agent.utils import load_chat_model
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Track the health of a provider over its most recent calls."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_s: float = 30.0,
+        slow_rate: float = 0.5,
+        cooldown_s: float = 30.0,
+    ) -> None:
+        """Open after ``min_calls`` calls of which too many failed or were slow."""
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_s = slow_call_s
+        self.slow_rate = slow_rate
+        self.cooldown_s = cooldown_s
+        self.state = "closed"
+        self.opened = 0
+        self._calls: deque[tuple[bool, float, bool]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may be sent to the provider now."""
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.cooldown_s:
+                    return False
+                self._transition("half_open")
+            if self.state == "half_open":
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record(
+        self, success: bool, latency_s: float, slow_call_s: Optional[float] = None
+    ) -> None:
+        """Record the outcome of a call.
+
+        ``slow_call_s`` overrides the breaker's own slow-call threshold.
+        """
+        slow = latency_s >= (slow_call_s or self.slow_call_s)
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+                if success and not slow:
+                    self._calls.clear()
+                    self._transition("closed")
+                else:
+                    self._open()
+                return
+            self._calls.append((success, latency_s, slow))
+            if self.state == "closed" and len(self._calls) >= self.min_calls:
+                failures = sum(not ok for ok, _, _ in self._calls) / len(self._calls)
+                slow_share = sum(s for _, _, s in self._calls) / len(self._calls)
+                if failures >= self.error_rate or slow_share >= self.slow_rate:
+                    self._open()
+
+    def release(self) -> None:
+        """End a call that says nothing about the provider's health."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self.opened += 1
+        self._transition("open")
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            logger.warning("Circuit for %s: %s -> %s", self.name, self.state, state)
+            self.state = state
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker's state and the statistics of its window."""
+        with self._lock:
+            calls = list(self._calls)
+        latencies = sorted(t for _, t, _ in calls)
+        return {
+            "state": self.state,
+            "times_opened": self.opened,
+            "calls": len(calls),
+            "error_rate": round(sum(not ok for ok, _, _ in calls) / len(calls), 3)
+            if calls
+            else 0.0,
+            "p95_latency_s": round(latencies[int(0.95 * (len(latencies) - 1))], 3)
+            if latencies
+            else None,
+        }
+
+
+class RetryBudget:
+    """Allow retries for at most ``ratio`` of the requests made to a provider."""
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0) -> None:
+        """Start with a full budget of ``max_tokens`` retries."""
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Credit the budget for a new request."""
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend one retry, if the budget allows it."""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_budgets: dict[str, RetryBudget] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of a provider."""
+    with _registry_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+            _budgets[provider] = RetryBudget()
+        return _breakers[provider]
+
+
+def breaker_metrics() -> dict[str, dict[str, Any]]:
+    """Return the state of every provider's circuit breaker and retry budget."""
+    with _registry_lock:
+        providers = dict(_breakers)
+    return {
+        provider: {
+            **breaker.snapshot(),
+            "retry_budget": round(_budgets[provider].tokens, 2),
+        }
+        for provider, breaker in providers.items()
+    }
+
+
+TRANSIENT_ERROR_NAMES = frozenset(
+    {
+        # Python and httpx
+        "TimeoutError",
+        "ConnectionError",
+        "TimeoutException",
+        "TransportError",
+        # OpenAI and Anthropic clients (APITimeoutError is an APIConnectionError)
+        "APIConnectionError",
+    }
+)
+"""Exception classes, by name, that signal a transient provider failure."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether ``error`` is worth a retry: a timeout, a lost connection, 429 or 5xx."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def backoff_delay(attempt: int, base_s: float = 0.5, max_s: float = 8.0) -> float:
+    """Full-jitter exponential backoff delay before retry number ``attempt``."""
+    return random.uniform(0, min(max_s, base_s * 2**attempt))
+
+
+class FailoverChatModel(Runnable[Any, Any]):
+    """A chat model that fails over between providers behind circuit breakers."""
+
+    def __init__(self, **model_kwargs: Any) -> None:
+        """Create the model; ``model_kwargs`` are passed to ``load_chat_model``."""
+        self.model_kwargs = model_kwargs
+        # Shared with the models derived by ``with_structured_output``
+        self._models: dict[tuple[str, float, Any], Runnable[Any, Any]] = {}
+        self._lock = threading.Lock()
+        self._structured: Optional[tuple[Any, tuple[tuple[str, Any], ...]]] = None
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> FailoverChatModel:
+        """Return a failover model whose providers all produce ``schema``.
+
+        The derived model reuses the providers loaded by this one, so calling
+        this once per node run does not load the models again.
+        """
+        derived = FailoverChatModel(**self.model_kwargs)
+        derived._models, derived._lock = self._models, self._lock
+        derived._structured = (schema, tuple(sorted(kwargs.items())))
+        return derived
+
+    @property
+    def replaying(self) -> bool:
+        """Whether calls are served from a cassette instead of the providers."""
+        cache = self.model_kwargs.get("cache")
+        return isinstance(cache, CassetteCache) and cache.cassette.replaying
+
+    def _model(self, name: str, timeout_s: float) -> Runnable[Any, Any]:
+        with self._lock:
+            return self._load(name, timeout_s, self._structured)
+
+    def _load(
+        self, name: str, timeout_s: float, structured: Optional[tuple[Any, Any]]
+    ) -> Runnable[Any, Any]:
+        key = (name, timeout_s, structured)
+        if key not in self._models:
+            if structured is not None:
+                schema, options = structured
+                model = cast(BaseChatModel, self._load(name, timeout_s, None))
+                self._models[key] = model.with_structured_output(
+                    schema, **dict(options)
+                )
+            else:
+                kwargs = dict(self.model_kwargs)
+                if self.replaying:
+                    # Not sent anywhere, and secrets are not part of the cache key
+                    kwargs.setdefault("api_key", "replay")
+                # Retries are handled here, across providers
+                self._models[key] = load_chat_model(
+                    name, timeout=timeout_s, max_retries=0, **kwargs
+                )
+        return self._models[key]
+
+    def invoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        """Invoke the first healthy provider, retrying and failing over on errors."""
+        config = ensure_config(config)
+        configuration = Configuration.from_runnable_config(config)
+        names = list(
+            dict.fromkeys([configuration.model, *configuration.fallback_models])
+        )
+
+        if self.replaying:
+            return self._replay(names, configuration, input, config, **kwargs)
+
+        slow_call_s = (
+            configuration.model_slow_call_s or 0.9 * configuration.model_timeout_s
+        )
+
+        last_error: Optional[Exception] = None
+        for name in names:
+            provider = name.split("/", maxsplit=1)[0]
+            try:
+                model = self._model(name, configuration.model_timeout_s)
+            except Exception as e:
+                # Missing API key or package: not an outage, try the next model
+                logger.warning("Cannot load %s: %r", name, e)
+                last_error = e
+                continue
+            breaker, budget = get_breaker(provider), _budgets[provider]
+            budget.deposit()
+            for attempt in range(configuration.model_max_retries + 1):
+                if attempt and not budget.withdraw():
+                    break
+                if not breaker.allow():
+                    break
+                start = time.monotonic()
+                try:
+                    result = model.invoke(input, config, **kwargs)
+                except Exception as e:
+                    if not is_transient(e):
+                        breaker.release()
+                        raise
+                    breaker.record(False, time.monotonic() - start, slow_call_s)
+                    logger.warning("%s failed (attempt %d): %r", name, attempt + 1, e)
+                    last_error = e
+                    if attempt < configuration.model_max_retries:
+                        time.sleep(backoff_delay(attempt))
+                    continue
+                breaker.record(True, time.monotonic() - start, slow_call_s)
+                return result
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(f"No model available, every circuit is open: {names}")
+
+    def _replay(
+        self,
+        names: list[str],
+        configuration: Configuration,
+        input: Any,
+        config: RunnableConfig,
+        **kwargs: Any,
+    ) -> Any:
+        misses: list[CassetteMiss] = []
+        for name in names:
+            try:
+                model = self._model(name, configuration.model_timeout_s)
+                return model.invoke(input, config, **kwargs)
+            except CassetteMiss as e:
+                # The call may have been recorded on a fallback model
+                misses.append(e)
+        raise misses[0]
@@ -41,6 +41,12 @@ class functional_requirement(BaseModel):
     )
 
 
+class RequirementHeadlines(BaseModel):
+    headlines: List[str] = Field(
+        description="Short one-line headline of every functional requirement.",
+    )
+
+
 class developer(BaseModel):
     affiliation: str = Field(
         description="Primary affiliation of the developer.",
@@ -68,7 +74,9 @@ class GenerateDeveloperState(TypedDict):
     max_developer: int  # Number of developers
     human_developer_feedback: str  # Human feedback
     developers: List[developer]  # developer asking questions
+    developer_merge_report: str  # Near-duplicate developers that were merged
     requirements: str  # Functional requirements
+    requirement_details: List[requirement]  # Structured requirements, in 'expanded' mode
 
 class InterviewState(MessagesState):
     max_num_turns: int  # Number turns of conversation
@@ -76,6 +84,7 @@ class InterviewState(MessagesState):
     developer: developer  # developer asking questions
     interview: str  # Interview transcript
     sections: list  # Final key we duplicate in outer state for Send() API
+    fingerprint: str  # Key of the interview in the interview cache
 
 class SearchQuery(BaseModel):
     search_query: str = Field(None, description="Search query for retrieval.")
@@ -85,6 +94,7 @@ class ResearchGraphState(TypedDict):
     max_developer: int  # Number of developers
     human_developer_feedback: str  # Human feedback
     developers: List[developer]  # developer asking questions
+    developer_merge_report: str  # Near-duplicate developers that were merged
     sections: Annotated[list, operator.add]  # Send() API key
     introduction: str  # Introduction for the final report
     content: str  # Content for the final report
@@ -6,29 +6,66 @@ These tools are intended as free examples to get started. For production use,
 consider implementing more robust and specialized tools tailored to your needs.
 """
 
-from typing import Any, Callable, List, Optional, cast
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Union, cast
 
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import InjectedToolArg
 from typing_extensions import Annotated
 
+from react_agent.cassette import cassette
 from react_agent.configuration import Configuration
+from react_agent.utils import reciprocal_rank_fusion
+
+logger = logging.getLogger(__name__)
 
 
 async def search(
-    query: str, *, config: Annotated[RunnableConfig, InjectedToolArg]
+    query: Union[str, List[str]], *, config: Annotated[RunnableConfig, InjectedToolArg]
 ) -> Optional[list[dict[str, Any]]]:
     """Search for general web results.
 
     This function performs a search using the Tavily search engine, which is designed
     to provide comprehensive, accurate, and trusted results. It's particularly useful
     for answering questions about current events.
+
+    Pass a list of differently phrased queries to cover a topic broadly in a
+    single call: they run concurrently and their results are merged.
     """
     configuration = Configuration.from_runnable_config(config)
-    wrapped = TavilySearchResults(max_results=configuration.max_search_results)
-    result = await wrapped.ainvoke({"query": query})
-    return cast(list[dict[str, Any]], result)
+    queries = list(dict.fromkeys([query] if isinstance(query, str) else query))
+    if not queries:
+        return []
+
+    async def run(q: str) -> Any:
+        return await cassette.acall(
+            "tavily",
+            {"query": q, "max_results": configuration.max_search_results},
+            # Built here: the tool needs TAVILY_API_KEY, which a replay does not
+            lambda: TavilySearchResults(
+                max_results=configuration.max_search_results
+            ).ainvoke({"query": q}),
+        )
+
+    if len(queries) == 1:
+        return cast(list[dict[str, Any]], await run(queries[0]))
+
+    outcomes = await asyncio.gather(*(run(q) for q in queries), return_exceptions=True)
+    rankings = []
+    for q, outcome in zip(queries, outcomes):
+        if isinstance(outcome, list):
+            rankings.append(outcome)
+        else:
+            # Tavily reports errors as a string result
+            logger.warning("Search for %r failed: %r", q, outcome)
+    if not rankings:
+        error = next((o for o in outcomes if isinstance(o, BaseException)), None)
+        if error is not None:
+            raise error
+        return cast(list[dict[str, Any]], outcomes[0])
+    return reciprocal_rank_fusion(rankings)[: configuration.max_search_results]
 
 
 TOOLS: List[Callable[..., Any]] = [search]
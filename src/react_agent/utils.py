@@ -1,9 +1,16 @@
 """Utility & helper functions."""
 
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Iterable, TypeVar, cast
+
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 
+T = TypeVar("T")
+
 
 def get_message_text(msg: BaseMessage) -> str:
     """Get the text content of a message."""
@@ -17,11 +24,123 @@ def get_message_text(msg: BaseMessage) -> str:
         return "".join(txts).strip()
 
 
-def load_chat_model(fully_specified_name: str) -> BaseChatModel:
+def load_chat_model(fully_specified_name: str, **kwargs: Any) -> BaseChatModel:
     """Load a chat model from a fully specified name.
 
     Args:
         fully_specified_name (str): String in the format 'provider/model'.
+        **kwargs: Extra parameters for the model, such as ``temperature``.
     """
     provider, model = fully_specified_name.split("/", maxsplit=1)
-    return init_chat_model(model, model_provider=provider)
+    return cast(
+        BaseChatModel, init_chat_model(model, model_provider=provider, **kwargs)
+    )
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    """Split a text into its set of lower-cased word ``size``-grams.
+
+    Texts shorter than ``size`` words yield a single shingle with all their words.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    """Compute the Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def novelty(text: str, seen: Iterable[str], size: int = 3) -> float:
+    """Return the share of ``text``'s shingles that do not appear in ``seen``.
+
+    1.0 means everything in ``text`` is new, 0.0 means it only repeats
+    the earlier texts.
+    """
+    new = shingles(text, size)
+    if not new:
+        return 0.0
+    previous: set[str] = set()
+    for other in seen:
+        previous |= shingles(other, size)
+    return len(new - previous) / len(new)
+
+
+def cluster_similar(
+    texts: list[str], threshold: float, size: int = 2
+) -> list[list[tuple[int, float]]]:
+    """Greedily group texts whose shingle Jaccard similarity reaches ``threshold``.
+
+    Each text joins the first earlier cluster whose leader it is similar enough to,
+    otherwise it starts a new cluster. Clusters are lists of
+    ``(index, similarity to the leader)``, with the leader first.
+    """
+    sets = [shingles(text, size) for text in texts]
+    clusters: list[list[tuple[int, float]]] = []
+    for i, current in enumerate(sets):
+        for cluster in clusters:
+            similarity = jaccard(sets[cluster[0][0]], current)
+            if similarity >= threshold:
+                cluster.append((i, similarity))
+                break
+        else:
+            clusters.append([(i, 1.0)])
+    return clusters
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[list[dict[str, Any]]], k: int = 60, key: str = "url"
+) -> list[dict[str, Any]]:
+    """Merge ranked result lists, scoring every result ``sum(1 / (k + rank))``.
+
+    Results are deduplicated on ``key`` (falling back to ``content``). The first
+    occurrence of a duplicate is kept, and ties keep first-seen order.
+    """
+    scores: dict[str, float] = {}
+    results: dict[str, dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            identity = str(result.get(key) or result.get("content", ""))
+            scores[identity] = scores.get(identity, 0.0) + 1 / (k + rank)
+            results.setdefault(identity, result)
+    return [results[i] for i in sorted(results, key=lambda i: -scores[i])]
+
+
+class LRUCache(Generic[T]):
+    """A thread-safe, size-bounded least-recently-used cache."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Keep at most ``maxsize`` entries."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        ``compute`` runs outside the lock, so concurrent misses on the same key
+        may both compute it.
+        """
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+
+search_cache: LRUCache[object] = LRUCache(maxsize=2048)
+"""Search results shared by every graph run in the process."""
@@ -0,0 +1,365 @@
+"""Run interview subgraphs on a pool of worker processes.
+
+Every ``conduct_interview`` payload (developer + seed messages) is written to a
+durable SQLite job queue. Worker processes claim jobs from the queue, run the
+compiled interview graph and write the resulting sections back. Jobs held by a
+crashed worker are released and retried until ``max_attempts`` is reached, and
+jobs whose lease expires (hung worker, killed supervisor) become claimable
+again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Iterator, Optional
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.runnables import RunnableConfig
+
+from react_agent.configuration import Configuration
+from react_agent.schemas import developer
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    leased_until REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_batch_status ON jobs (batch_id, status);
+"""
+
+
+def encode_payload(payload: dict[str, Any]) -> str:
+    """Serialize a ``conduct_interview`` payload to JSON."""
+    data = dict(payload)
+    data["developer"] = payload["developer"].model_dump()
+    data["messages"] = messages_to_dict(payload["messages"])
+    return json.dumps(data)
+
+
+def decode_payload(raw: str) -> dict[str, Any]:
+    """Rebuild a ``conduct_interview`` payload from its JSON form."""
+    data: dict[str, Any] = json.loads(raw)
+    data["developer"] = developer(**data["developer"])
+    data["messages"] = messages_from_dict(data["messages"])
+    return data
+
+
+class JobQueue:
+    """A durable job queue backed by a local SQLite database.
+
+    The queue is safe to share between processes: every process opens its own
+    connection and claims are made inside an immediate transaction.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 900.0) -> None:
+        """Open (and create if needed) the queue stored at ``path``."""
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def enqueue(
+        self, batch_id: str, payloads: list[str], max_attempts: int = 3
+    ) -> list[int]:
+        """Add serialized payloads to a batch and return their job ids."""
+        ids = []
+        with self._transaction() as conn:
+            for position, payload in enumerate(payloads):
+                cursor = conn.execute(
+                    "INSERT INTO jobs (batch_id, position, payload, max_attempts) "
+                    "VALUES (?, ?, ?, ?)",
+                    (batch_id, position, payload, max_attempts),
+                )
+                ids.append(int(cursor.lastrowid or 0))
+        return ids
+
+    def claim(self, batch_id: str, worker: str) -> Optional[tuple[int, str]]:
+        """Lease the next runnable job of a batch to ``worker``."""
+        now = time.time()
+        with self._transaction() as conn:
+            # Expired leases that used up their attempts will never run again
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired' "
+                "WHERE batch_id = ? AND status = 'running' AND leased_until < ? "
+                "AND attempts >= max_attempts",
+                (batch_id, now),
+            )
+            row = conn.execute(
+                "SELECT id, payload FROM jobs WHERE batch_id = ? AND ("
+                "status = 'queued' OR (status = 'running' AND leased_until < ?)"
+                ") ORDER BY position LIMIT 1",
+                (batch_id, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "worker = ?, leased_until = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, row[0]),
+                )
+        return None if row is None else (int(row[0]), str(row[1]))
+
+    def complete(self, job_id: int, result: dict[str, Any]) -> None:
+        """Store the result of a finished job."""
+        self._conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, leased_until = NULL "
+            "WHERE id = ?",
+            (json.dumps(result), job_id),
+        )
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Record a failed attempt, requeueing the job if it has attempts left."""
+        self._conn.execute(
+            "UPDATE jobs SET error = ?, leased_until = NULL, worker = NULL, "
+            "status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END "
+            "WHERE id = ?",
+            (error, job_id),
+        )
+
+    def release_worker(self, batch_id: str, worker: str, error: str) -> int:
+        """Treat every job leased to a dead ``worker`` as a failed attempt."""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET error = ?, leased_until = NULL, worker = NULL, "
+            "status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END "
+            "WHERE batch_id = ? AND worker = ? AND status = 'running'",
+            (error, batch_id, worker),
+        )
+        return cursor.rowcount
+
+    def fail_outstanding(self, batch_id: str, error: str) -> int:
+        """Mark every queued or running job of a batch as failed."""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, leased_until = NULL "
+            "WHERE batch_id = ? AND status IN ('queued', 'running')",
+            (error, batch_id),
+        )
+        return cursor.rowcount
+
+    def outstanding(self, batch_id: str) -> int:
+        """Count the jobs of a batch that are queued or running."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE batch_id = ? "
+            "AND status IN ('queued', 'running')",
+            (batch_id,),
+        ).fetchone()
+        return int(row[0])
+
+    def delete_batch(self, batch_id: str) -> int:
+        """Remove every job of a batch, returning how many were removed."""
+        cursor = self._conn.execute("DELETE FROM jobs WHERE batch_id = ?", (batch_id,))
+        return cursor.rowcount
+
+    def results(self, batch_id: str) -> list[dict[str, Any]]:
+        """Return the jobs of a batch in submission order."""
+        rows = self._conn.execute(
+            "SELECT id, status, attempts, result, error FROM jobs "
+            "WHERE batch_id = ? ORDER BY position",
+            (batch_id,),
+        ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "status": row[1],
+                "attempts": row[2],
+                "result": json.loads(row[3]) if row[3] else None,
+                "error": row[4],
+            }
+            for row in rows
+        ]
+
+
+def _worker_main(
+    queue_path: str,
+    batch_id: str,
+    worker: str,
+    lease_seconds: float,
+    poll_interval: float,
+    configurable: dict[str, Any],
+) -> None:
+    # Imported here: the graph module imports node.py, which imports this module.
+    from react_agent.graph import compiled_interview_graph
+
+    queue = JobQueue(queue_path, lease_seconds=lease_seconds)
+    config: RunnableConfig = {"configurable": configurable}
+    try:
+        while queue.outstanding(batch_id):
+            job = queue.claim(batch_id, worker)
+            if job is None:
+                # Other workers hold the remaining jobs; wait for them or their leases
+                time.sleep(poll_interval)
+                continue
+            job_id, payload = job
+            try:
+                output = compiled_interview_graph.invoke(
+                    decode_payload(payload), config
+                )
+            except Exception as e:
+                logger.exception("Interview job %s failed on %s", job_id, worker)
+                queue.fail(job_id, repr(e))
+            else:
+                queue.complete(
+                    job_id,
+                    {
+                        "sections": output.get("sections", []),
+                        "interview": output.get("interview", ""),
+                    },
+                )
+    finally:
+        queue.close()
+
+
+class InterviewWorkerPool:
+    """Fan interview payloads out to worker processes through a ``JobQueue``."""
+
+    def __init__(
+        self,
+        num_workers: int,
+        queue_path: str,
+        *,
+        max_attempts: int = 3,
+        lease_seconds: float = 900.0,
+        poll_interval: float = 0.5,
+    ) -> None:
+        """Configure the pool; processes are only started by ``run``."""
+        # Function run by every worker process; replaceable in tests
+        self.worker_target = _worker_main
+        self.num_workers = num_workers
+        self.queue_path = queue_path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+    def _spawn(
+        self, ctx: Any, batch_id: str, configurable: dict[str, Any]
+    ) -> tuple[str, Any]:
+        worker = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        process = ctx.Process(
+            target=self.worker_target,
+            args=(
+                self.queue_path,
+                batch_id,
+                worker,
+                self.lease_seconds,
+                self.poll_interval,
+                configurable,
+            ),
+            daemon=True,
+        )
+        process.start()
+        return worker, process
+
+    def run(
+        self, payloads: list[dict[str, Any]], configuration: Configuration
+    ) -> list[dict[str, Any]]:
+        """Run every payload through the interview graph and return the results.
+
+        Results are returned in the order of ``payloads``. Workers that die are
+        replaced, at most ``num_workers * max_attempts`` times per batch, so a
+        worker that cannot start fails the batch instead of respawning forever.
+
+        Raises:
+            RuntimeError: If a job is still failing after ``max_attempts``, or
+                workers kept dying.
+        """
+        if not payloads:
+            return []
+        queue = JobQueue(self.queue_path, lease_seconds=self.lease_seconds)
+        batch_id = uuid.uuid4().hex
+        queue.enqueue(
+            batch_id,
+            [encode_payload(payload) for payload in payloads],
+            max_attempts=self.max_attempts,
+        )
+        configurable = asdict(configuration)
+        ctx = multiprocessing.get_context("spawn")
+        workers = dict(
+            self._spawn(ctx, batch_id, configurable)
+            for _ in range(min(self.num_workers, len(payloads)))
+        )
+        restarts = 0
+        max_restarts = self.num_workers * self.max_attempts
+        try:
+            while queue.outstanding(batch_id):
+                for worker, process in list(workers.items()):
+                    if process.is_alive():
+                        continue
+                    del workers[worker]
+                    released = queue.release_worker(
+                        batch_id, worker, f"worker exited with code {process.exitcode}"
+                    )
+                    if released:
+                        logger.warning(
+                            "Interview worker %s died (exit code %s), requeued %d job(s)",
+                            worker,
+                            process.exitcode,
+                            released,
+                        )
+                    if not queue.outstanding(batch_id):
+                        continue
+                    if restarts >= max_restarts:
+                        abandoned = queue.fail_outstanding(
+                            batch_id,
+                            f"workers died {restarts + 1} times, last with exit code "
+                            f"{process.exitcode}",
+                        )
+                        logger.error(
+                            "Giving up on %d interview job(s) after %d worker restarts",
+                            abandoned,
+                            restarts,
+                        )
+                        break
+                    restarts += 1
+                    new_worker, new_process = self._spawn(ctx, batch_id, configurable)
+                    workers[new_worker] = new_process
+                time.sleep(self.poll_interval)
+            for process in workers.values():
+                process.join()
+            jobs = queue.results(batch_id)
+        finally:
+            for process in workers.values():
+                if process.is_alive():
+                    process.terminate()
+            # Batch ids are not reused: keep the queue file from growing with every run
+            queue.delete_batch(batch_id)
+            queue.close()
+
+        failed = [job for job in jobs if job["status"] != "done"]
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} interview job(s) failed after {self.max_attempts} "
+                f"attempts: {[job['error'] for job in failed]}"
+            )
+        return [job["result"] for job in jobs]
@@ -0,0 +1,50 @@
+from react_agent.autotune import CallSamples, autotune, evaluate, write_profile
+from react_agent.configuration import Configuration
+
+
+def test_more_turns_cost_more() -> None:
+    samples = CallSamples()
+    base = {
+        "max_developer": 2,
+        "max_num_turns": 1,
+        "web_search_max_results": 3,
+        "wikipedia_max_docs": 2,
+    }
+    short = evaluate(base, samples, runs=50)
+    long = evaluate({**base, "max_num_turns": 3}, samples, runs=50)
+    assert long["p95_latency_s"] > short["p95_latency_s"]
+    assert long["mean_tokens"] > short["mean_tokens"]
+
+
+def test_expanded_requirements_cost_more_calls_in_parallel() -> None:
+    samples = CallSamples(llm_latency=[2.0], llm_tokens=[1000])
+    base = {
+        "max_developer": 1,
+        "max_num_turns": 1,
+        "web_search_max_results": 1,
+        "wikipedia_max_docs": 0,
+    }
+    single = evaluate(base, samples, runs=5)
+    expanded = evaluate(
+        base,
+        samples,
+        runs=5,
+        configuration=Configuration(requirements_mode="expanded", max_requirements=4),
+    )
+    # Headlines and 4 expansions instead of one call, 2 calls on the path
+    assert expanded["mean_tokens"] == single["mean_tokens"] + 4 * 1000
+    assert expanded["p95_latency_s"] == single["p95_latency_s"] + 2.0
+
+
+def test_profile_loads_into_configuration(tmp_path) -> None:
+    profile = autotune(CallSamples(), target_p95_latency_s=60, runs=20)
+    assert profile["feasible"]
+    assert profile["metrics"]["p95_latency_s"] <= 60
+
+    path = str(tmp_path / "profile.json")
+    write_profile(path, profile)
+    configuration = Configuration.from_runnable_config(
+        {"configurable": {"tuning_profile": path, "max_developer": 7}}
+    )
+    assert configuration.max_num_turns == profile["parameters"]["max_num_turns"]
+    assert configuration.max_developer == 7
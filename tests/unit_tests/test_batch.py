@@ -0,0 +1,56 @@
+import asyncio
+from typing import TypedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from react_agent.batch import completed_ids, read_topics, run_topic
+
+
+class State(TypedDict, total=False):
+    topic: str
+    human_developer_feedback: str
+    final_report: str
+
+
+def test_run_topic_answers_interrupts() -> None:
+    seen = []
+
+    def human_feedback(state: State):
+        pass
+
+    def route(state: State):
+        seen.append(state["human_developer_feedback"])
+        return (
+            "write"
+            if state["human_developer_feedback"] == "approve"
+            else "human_feedback"
+        )
+
+    def write(state: State):
+        return {"final_report": f"Report on {state['topic']}"}
+
+    builder = StateGraph(State)
+    builder.add_node("human_feedback", human_feedback)
+    builder.add_node("write", write)
+    builder.add_edge(START, "human_feedback")
+    builder.add_conditional_edges("human_feedback", route, ["human_feedback", "write"])
+    builder.add_edge("write", END)
+    graph = builder.compile(
+        checkpointer=MemorySaver(), interrupt_before=["human_feedback"]
+    )
+
+    record = {"id": "1", "topic": "todo app", "feedback": {"human_feedback": ["more"]}}
+    result = asyncio.run(run_topic(graph, record, {}))
+    assert (seen[0], seen[-1]) == ("more", "approve")
+    assert result["status"] == "ok"
+    assert result["final_report"] == "Report on todo app"
+
+
+def test_resume_skips_completed(tmp_path) -> None:
+    topics = tmp_path / "topics.jsonl"
+    topics.write_text('{"topic": "a"}\n\n{"id": "x", "topic": "b"}\n')
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"id": "1", "status": "ok"}\n{"id": "x", "status": "error"}\n')
+    assert [t["id"] for t in read_topics(str(topics))] == ["1", "x"]
+    assert completed_ids(str(output)) == {"1"}
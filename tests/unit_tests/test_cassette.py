@@ -0,0 +1,58 @@
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from react_agent.cassette import (
+    Cassette,
+    CassetteMiss,
+    decode_documents,
+    encode_documents,
+)
+
+
+def test_llm_record_then_replay(tmp_path) -> None:
+    path = str(tmp_path / "run.jsonl.gz")
+    recorder = Cassette(path, "record")
+    live = FakeListChatModel(responses=["recorded"], cache=recorder.llm_cache)
+    assert live.invoke("hello").content == "recorded"
+
+    player = Cassette(path, "replay")
+    offline = FakeListChatModel(responses=["recorded"], cache=player.llm_cache)
+    assert offline.invoke("hello").content == "recorded"
+    assert offline.i == 0
+    with pytest.raises(CassetteMiss):
+        offline.invoke("never recorded")
+
+
+def test_llm_replay_of_multi_turn_prompt(tmp_path) -> None:
+    path = str(tmp_path / "run.jsonl")
+
+    def converse(cassette: Cassette) -> list[str]:
+        model = FakeListChatModel(
+            responses=["first", "second"], cache=cassette.llm_cache
+        )
+        messages = [HumanMessage(content="hello")]
+        # The generated message is part of the next prompt
+        messages.append(model.invoke(messages))
+        messages.append(HumanMessage(content="go on"))
+        return [messages[1].content, model.invoke(messages).content]
+
+    assert converse(Cassette(path, "record")) == ["first", "second"]
+    assert converse(Cassette(path, "replay")) == ["first", "second"]
+
+
+def test_search_record_then_replay(tmp_path) -> None:
+    path = str(tmp_path / "run.jsonl")
+    docs = [Document(page_content="LangGraph", metadata={"source": "wiki"})]
+    recorder = Cassette(path, "record")
+    recorder.call(
+        "wikipedia", {"query": "q"}, lambda: docs, encode_documents, decode_documents
+    )
+
+    player = Cassette(path, "replay")
+    replayed = player.call(
+        "wikipedia", {"query": "q"}, lambda: [], encode_documents, decode_documents
+    )
+    assert replayed == docs
+    assert player.get("wikipedia", {"query": "q"})["latency"] >= 0
@@ -0,0 +1,44 @@
+from react_agent.node import deduplicate_developers, developer
+
+
+def make_developer(name: str, affiliation: str, role: str, description: str):
+    return developer(
+        name=name, affiliation=affiliation, role=role, description=description
+    )
+
+
+def test_merges_same_focus_under_different_names() -> None:
+    developers = [
+        make_developer(
+            "Ada Lovelace",
+            "Acme",
+            "Backend engineer",
+            "Designs the sync API and worries about conflict resolution when "
+            "devices come back online.",
+        ),
+        make_developer(
+            "Grace Hopper",
+            "Initech",
+            "Backend engineer",
+            "Designs the sync API and worries about conflict resolution when "
+            "clients come back online.",
+        ),
+        make_developer(
+            "Alan Turing",
+            "Acme",
+            "Mobile developer",
+            "Builds the offline-first UI and cares about battery usage.",
+        ),
+    ]
+
+    update = deduplicate_developers({"developers": developers}, {})
+
+    assert [d.name for d in update["developers"]] == ["Ada Lovelace", "Alan Turing"]
+    assert (
+        "Merged Grace Hopper (Backend engineer) into Ada Lovelace"
+        in (update["developer_merge_report"])
+    )
+    assert (
+        "Interviews avoided: 1 (~9 LLM calls, ~4 search calls)"
+        in (update["developer_merge_report"])
+    )
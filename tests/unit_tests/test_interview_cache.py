@@ -0,0 +1,66 @@
+from dataclasses import replace
+
+from langgraph.constants import Send
+
+from react_agent.configuration import Configuration
+from react_agent.interview_cache import InterviewCache, interview_fingerprint
+from react_agent.schemas import developer
+
+
+def make_developer(description: str = "Cares about offline sync.") -> developer:
+    return developer(
+        affiliation="Acme", name="Ada", role="Backend", description=description
+    )
+
+
+def test_fingerprint_tracks_persona_topic_and_settings() -> None:
+    configuration = Configuration()
+    key = interview_fingerprint(make_developer(), "todo app", configuration)
+
+    assert key == interview_fingerprint(make_developer(), "todo app", Configuration())
+    assert key != interview_fingerprint(
+        make_developer("Cares about auth."), "todo app", configuration
+    )
+    assert key != interview_fingerprint(make_developer(), "chat app", configuration)
+    assert key != interview_fingerprint(
+        make_developer(), "todo app", replace(configuration, max_num_turns=3)
+    )
+    # Settings that do not affect the interview keep the key
+    assert key == interview_fingerprint(
+        make_developer(), "todo app", replace(configuration, max_developer=5)
+    )
+
+
+def test_cache_round_trip(tmp_path) -> None:
+    cache = InterviewCache(str(tmp_path / "interviews.sqlite"))
+    assert cache.get("abc") is None
+    cache.put("abc", {"sections": ["## Sync"], "interview": "Q/A", "context": ["doc"]})
+    assert cache.get("abc") == {
+        "sections": ["## Sync"],
+        "interview": "Q/A",
+        "context": ["doc"],
+    }
+    cache.close()
+
+
+def test_only_changed_developers_are_interviewed(tmp_path) -> None:
+    from react_agent.node import initiate_all_interviews
+
+    path = str(tmp_path / "interviews.sqlite")
+    config = {"configurable": {"interview_cache_path": path}}
+    kept, changed = make_developer(), make_developer("Cares about auth.")
+    cache = InterviewCache(path)
+    cache.put(
+        interview_fingerprint(
+            kept, "todo app", Configuration(interview_cache_path=path)
+        ),
+        {"sections": ["## Sync"]},
+    )
+    cache.close()
+
+    sends = initiate_all_interviews(
+        {"topic": "todo app", "developers": [kept, changed]}, config
+    )
+    assert sends[0] == Send("reuse_interview", {"sections": ["## Sync"]})
+    assert sends[1].node == "conduct_interview"
+    assert sends[1].arg["developer"] == changed
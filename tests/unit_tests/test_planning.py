@@ -0,0 +1,91 @@
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from react_agent.configuration import Configuration
+from react_agent.planning import CallCost, Limits, admit, plan_run, reshape
+
+
+def _noop(state: MessagesState):
+    return {}
+
+
+def _graph():
+    interview = StateGraph(MessagesState)
+    for name in ["ask_question", "search_web", "search_wikipedia", "answer_question"]:
+        interview.add_node(name, _noop)
+    interview.add_edge(START, "ask_question")
+    interview.add_edge("ask_question", "search_web")
+    interview.add_edge("ask_question", "search_wikipedia")
+    interview.add_edge("search_web", "answer_question")
+    interview.add_edge("search_wikipedia", "answer_question")
+    interview.add_conditional_edges(
+        "answer_question", lambda state: END, ["ask_question", END]
+    )
+
+    main = StateGraph(MessagesState)
+    main.add_node("process_requirements", _noop)
+    main.add_node("conduct_interview", interview.compile())
+    main.add_edge(START, "process_requirements")
+    main.add_edge("process_requirements", "conduct_interview")
+    main.add_edge("conduct_interview", END)
+    return main.compile()
+
+
+def test_plan_run_multiplies_loops_and_fanout() -> None:
+    cost = CallCost(llm_latency_s=1.0, llm_tokens=100.0, search_latency_s=0.5)
+    plan = plan_run(
+        _graph(), Configuration(max_developer=3, max_num_turns=2), cost=cost
+    )
+    # 1 + 3 developers * 2 turns * (question + 2 search queries + answer)
+    assert plan.llm_calls == 25
+    assert plan.search_calls == 12
+
+    no_wikipedia = plan_run(
+        _graph(),
+        Configuration(max_developer=3, max_num_turns=2, wikipedia_max_docs=0),
+        cost=cost,
+    )
+    assert no_wikipedia.llm_calls == 19
+    assert no_wikipedia.search_calls == 6
+    assert plan.tokens == 2500
+    # 1 + 2 turns * (question + search query and search + answer)
+    assert plan.critical_path_s == 1 + 2 * (1 + 1.5 + 1)
+    assert plan.peak_concurrency == 6
+    assert plan.executions["conduct_interview/ask_question"] == 6
+
+    pooled = plan_run(
+        _graph(),
+        Configuration(max_developer=3, max_num_turns=2, interview_workers=1),
+        cost=cost,
+    )
+    assert pooled.critical_path_s == 1 + 3 * 2 * 3.5
+
+
+def test_plan_run_counts_expanded_requirements() -> None:
+    cost = CallCost(llm_latency_s=1.0, llm_tokens=100.0, search_latency_s=0.5)
+    configuration = Configuration(max_developer=3, max_num_turns=2)
+    single = plan_run(_graph(), configuration, cost=cost)
+    expanded = plan_run(
+        _graph(),
+        Configuration(
+            max_developer=3,
+            max_num_turns=2,
+            requirements_mode="expanded",
+            max_requirements=4,
+        ),
+        cost=cost,
+    )
+    # Headlines and 4 expansions instead of a single call
+    assert expanded.llm_calls == single.llm_calls + 4
+    # The expansions run in parallel: one more call on the critical path
+    assert expanded.critical_path_s == single.critical_path_s + 1
+    assert expanded.peak_concurrency == 6
+
+
+def test_admit_and_reshape() -> None:
+    configuration = Configuration(max_developer=3, max_num_turns=2)
+    limits = Limits(max_llm_calls=10)
+    assert admit(plan_run(_graph(), configuration), limits)
+    reshaped = reshape(_graph(), configuration, limits)
+    assert reshaped is not None
+    assert (reshaped.max_num_turns, reshaped.max_developer) == (1, 2)
+    assert reshape(_graph(), configuration, Limits(max_llm_calls=1)) is None
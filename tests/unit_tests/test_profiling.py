@@ -0,0 +1,32 @@
+import tracemalloc
+
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from react_agent.profiling import load_timeline, profiled, superstep_timeline
+
+
+def test_profiled_node_writes_timeline(tmp_path) -> None:
+    def answer(state: MessagesState):
+        return {"messages": [("ai", "hello " * 100)]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("answer", profiled(answer))
+    builder.add_edge(START, "answer")
+    builder.add_edge("answer", END)
+    graph = builder.compile()
+
+    path = str(tmp_path / "timeline.jsonl")
+    graph.invoke({"messages": [("user", "hi")]})
+    graph.invoke(
+        {"messages": [("user", "hi")]},
+        {"configurable": {"profile_memory": True, "profile_path": path}},
+    )
+
+    # Tracing stops with the profiled run
+    assert not tracemalloc.is_tracing()
+
+    [record] = load_timeline(path)
+    assert record["node"] == "answer"
+    assert record["graph"] == ""
+    assert record["update_bytes"]["messages"] > record["state_bytes"]["messages"]
+    assert superstep_timeline([record])[0]["nodes"] == ["answer"]
@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.memory import MemorySaver
+
+from react_agent.cassette import Cassette
+from react_agent.graph import builder
+from react_agent.resilience import FailoverChatModel
+
+API_KEYS = ["OPENAI_API_KEY", "ANTHROPIC_API_KEY", "FIREWORKS_API_KEY"]
+
+
+def write_report(monkeypatch: pytest.MonkeyPatch, cassette: Cassette) -> str:
+    # The graph imports node.py as a top-level module
+    monkeypatch.setattr(
+        sys.modules["node"],
+        "llm",
+        FailoverChatModel(temperature=0, cache=cassette.llm_cache),
+    )
+    graph = builder.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "replay"}}
+    graph.update_state(
+        config,
+        {"topic": "todo app", "sections": ["## Offline sync\nUse CRDTs."]},
+        as_node="conduct_interview",
+    )
+    return graph.invoke(None, config)["final_report"]
+
+
+def test_report_replays_without_api_keys(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    path = str(tmp_path / "run.jsonl")
+
+    def generate(self, messages, *args, **kwargs):
+        prompt = messages[0].content
+        text = "## Insights\nSync" if "## Insights" in prompt else "Intro or outro"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(text))])
+
+    for key in API_KEYS:
+        monkeypatch.setenv(key, "test")
+    monkeypatch.setattr(ChatOpenAI, "_generate", generate)
+    recorded = write_report(monkeypatch, Cassette(path, "record"))
+
+    def offline(self, *args, **kwargs):
+        raise AssertionError("replay reached the provider")
+
+    for key in API_KEYS:
+        monkeypatch.delenv(key)
+    monkeypatch.setattr(ChatOpenAI, "_generate", offline)
+    assert write_report(monkeypatch, Cassette(path, "replay")) == recorded
@@ -0,0 +1,33 @@
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from react_agent import node
+
+
+class StubModel:
+    def with_structured_output(self, schema):
+        def call(messages):
+            if schema is node.RequirementHeadlines:
+                return schema(headlines=["Sync", "Auth", "Search"])
+            prompt = messages[0].content
+            headline = prompt.split("Detail only this requirement:\n")[1].split("\n")[0]
+            return schema(
+                description=headline,
+                suggestions="-",
+                presumptions="-",
+                questions=[f"Why {headline}?"],
+            )
+
+        return RunnableLambda(call)
+
+
+def test_expanded_requirements(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(node, "llm", StubModel())
+    config = {"configurable": {"requirements_mode": "expanded", "max_requirements": 2}}
+
+    update = node.process_requirements({"topic": "todo app"}, config)
+
+    assert [r.description for r in update["requirement_details"]] == ["Sync", "Auth"]
+    assert update["requirements"].startswith("1. Sync\nDescription: Sync\n")
+    assert "2. Auth\n" in update["requirements"]
+    assert "Questions: Why Auth?" in update["requirements"]
@@ -0,0 +1,206 @@
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from react_agent import resilience
+from react_agent.cassette import Cassette, CassetteMiss
+from react_agent.resilience import (
+    CircuitBreaker,
+    FailoverChatModel,
+    RetryBudget,
+    is_transient,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "_budgets", {})
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0.0)
+
+
+def test_breaker_opens_on_errors_and_recovers_after_probe() -> None:
+    breaker = CircuitBreaker("openai", min_calls=4, error_rate=0.5, cooldown_s=0.0)
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok, 0.1)
+    assert breaker.state == "open"
+
+    # After the cooldown a single probe is let through
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["times_opened"] == 1
+
+
+def test_breaker_opens_on_slow_calls() -> None:
+    breaker = CircuitBreaker("openai", min_calls=2, slow_call_s=1.0, slow_rate=0.5)
+    breaker.record(True, 5.0)
+    breaker.record(True, 5.0)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_retry_budget_is_bounded() -> None:
+    budget = RetryBudget(ratio=0.5, max_tokens=1.0)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_failover_to_next_provider(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def load(name: str, **kwargs):
+        def call(messages):
+            calls.append(name)
+            if name.startswith("openai/"):
+                raise TimeoutError("upstream timed out")
+            return f"answer from {name}"
+
+        return RunnableLambda(call)
+
+    monkeypatch.setattr(resilience, "load_chat_model", load)
+    config = {
+        "configurable": {
+            "model": "openai/gpt-4o",
+            "fallback_models": ["anthropic/claude", "fireworks/llama"],
+            "model_max_retries": 1,
+        }
+    }
+
+    llm = FailoverChatModel(temperature=0)
+    assert llm.invoke("hi", config) == "answer from anthropic/claude"
+    assert calls == ["openai/gpt-4o", "openai/gpt-4o", "anthropic/claude"]
+
+    metrics = resilience.breaker_metrics()
+    assert metrics["openai"]["error_rate"] == 1.0
+    assert metrics["anthropic"]["state"] == "closed"
+
+
+def test_open_circuit_is_skipped(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        resilience,
+        "load_chat_model",
+        lambda name, **kwargs: FakeListChatModel(responses=[name]),
+    )
+    resilience.get_breaker("openai")._open()
+    config = {
+        "configurable": {
+            "model": "openai/gpt-4o",
+            "fallback_models": ["anthropic/claude"],
+        }
+    }
+
+    assert FailoverChatModel().invoke("hi", config).content == "anthropic/claude"
+    assert resilience.breaker_metrics()["openai"]["calls"] == 0
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+def test_only_transient_errors_fail_over(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert is_transient(TimeoutError())
+    assert not is_transient(BadRequestError())
+    calls = []
+
+    def load(name: str, **kwargs):
+        def call(messages):
+            calls.append(name)
+            raise BadRequestError("invalid request")
+
+        return RunnableLambda(call)
+
+    monkeypatch.setattr(resilience, "load_chat_model", load)
+    config = {
+        "configurable": {
+            "model": "openai/gpt-4o",
+            "fallback_models": ["anthropic/claude"],
+        }
+    }
+
+    with pytest.raises(BadRequestError):
+        FailoverChatModel().invoke("hi", config)
+    assert calls == ["openai/gpt-4o"]
+    assert resilience.breaker_metrics()["openai"]["calls"] == 0
+
+
+def test_streams_through_a_chain(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        resilience,
+        "load_chat_model",
+        lambda name, **kwargs: FakeListChatModel(responses=["streamed"]),
+    )
+    chain = RunnableLambda(lambda text: text.upper()) | FailoverChatModel()
+    chunks = list(chain.stream("hi", {"configurable": {"model": "openai/gpt-4o"}}))
+    assert "".join(chunk.content for chunk in chunks) == "streamed"
+
+
+def test_slow_call_threshold_follows_the_model_timeout() -> None:
+    breaker = CircuitBreaker("openai", min_calls=2)
+    breaker.record(True, 40.0, slow_call_s=54.0)
+    breaker.record(True, 40.0, slow_call_s=54.0)
+    assert breaker.state == "closed"
+
+
+def test_replay_uses_the_recorded_fallback(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(
+        resilience,
+        "load_chat_model",
+        lambda name, **kwargs: FakeListChatModel(
+            responses=[name], cache=kwargs["cache"]
+        ),
+    )
+    path = str(tmp_path / "run.jsonl")
+    recorder = Cassette(path, "record")
+    # Recorded while OpenAI was down
+    config = {"configurable": {"model": "anthropic/claude", "fallback_models": []}}
+    FailoverChatModel(cache=recorder.llm_cache).invoke("hi", config)
+
+    player = Cassette(path, "replay")
+    config = {
+        "configurable": {
+            "model": "openai/gpt-4o",
+            "fallback_models": ["anthropic/claude"],
+        }
+    }
+    llm = FailoverChatModel(cache=player.llm_cache)
+    assert llm.invoke("hi", config).content == "anthropic/claude"
+    with pytest.raises(CassetteMiss):
+        llm.invoke("never recorded", config)
+    assert "openai" not in resilience.breaker_metrics()
+
+
+def test_structured_output_reuses_loaded_models(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    loads = []
+
+    class Model(FakeListChatModel):
+        def with_structured_output(self, schema, **kwargs):
+            return RunnableLambda(lambda messages: schema(answer=self.responses[0]))
+
+    def load(name: str, **kwargs):
+        loads.append(name)
+        return Model(responses=[name])
+
+    monkeypatch.setattr(resilience, "load_chat_model", load)
+    config = {"configurable": {"model": "openai/gpt-4o"}}
+
+    class Answer(BaseModel):
+        answer: str
+
+    llm = FailoverChatModel(temperature=0)
+    for _ in range(3):
+        structured = llm.with_structured_output(Answer)
+        assert structured.invoke("hi", config) == Answer(answer="openai/gpt-4o")
+    assert llm.invoke("hi", config).content == "openai/gpt-4o"
+    assert loads == ["openai/gpt-4o"]
@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from react_agent.node import route_messages
+
+ANSWER = "Use a message queue to decouple the ingestion service from the API."
+
+
+def turn(question: str, answer: str) -> list:
+    usage = {"input_tokens": 90, "output_tokens": 10, "total_tokens": 100}
+    return [
+        AIMessage(content=question, usage_metadata=usage),
+        AIMessage(content=answer, name="expert", usage_metadata=usage),
+    ]
+
+
+def interview(*answers: str) -> list:
+    messages = [HumanMessage(content="So you said you were writing an article?")]
+    for number, answer in enumerate(answers, start=1):
+        messages += turn(f"Question {number}?", answer)
+    return messages
+
+
+CONFIG = {"configurable": {"max_num_turns": 4}}
+
+
+def test_routes_to_next_question_while_answers_are_new() -> None:
+    state = {
+        "messages": interview(ANSWER, "Cache the hot rows in Redis with a short TTL.")
+    }
+    assert route_messages(state, CONFIG) == "ask_question"
+
+
+def test_stops_on_repeated_answer(caplog: pytest.LogCaptureFixture) -> None:
+    state = {"messages": interview(ANSWER, ANSWER)}
+    with caplog.at_level(logging.INFO, logger="react_agent.node"):
+        assert route_messages(state, CONFIG) == "save_interview"
+    # 4 messages of 100 tokens over 2 answers, for the 2 turns not taken
+    assert "saved 2 turn(s), ~400 tokens" in caplog.text
+
+
+def test_stops_at_max_turns_and_on_thanks() -> None:
+    state = {"messages": interview(ANSWER, "Cache the hot rows in Redis.")}
+    assert (
+        route_messages(state, {"configurable": {"max_num_turns": 2}})
+        == "save_interview"
+    )
+
+    messages = interview(ANSWER)
+    messages[-2] = AIMessage(content="Thank you so much for your help!")
+    assert route_messages({"messages": messages}, CONFIG) == "save_interview"
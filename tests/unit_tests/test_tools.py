@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from react_agent import tools
+
+
+def test_search_fuses_concurrent_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+    results = {
+        "offline sync": [{"url": "a"}, {"url": "b"}],
+        "crdt todo app": [{"url": "b"}, {"url": "c"}],
+        "broken": "HTTPError('502 Bad Gateway')",
+    }
+    queries = []
+
+    async def acall(kind, request, fn, **kwargs):
+        queries.append(request["query"])
+        await asyncio.sleep(0)
+        return results[request["query"]]
+
+    monkeypatch.setattr(tools.cassette, "acall", acall)
+    config = {"configurable": {"max_search_results": 2}}
+
+    fused = asyncio.run(
+        tools.search(
+            ["offline sync", "crdt todo app", "broken", "offline sync"], config=config
+        )
+    )
+    assert fused == [{"url": "b"}, {"url": "a"}]
+    assert queries == ["offline sync", "crdt todo app", "broken"]
+
+    assert asyncio.run(tools.search([], config=config)) == []
+
+    # A single query returns the search results unchanged
+    assert asyncio.run(tools.search("broken", config=config)) == results["broken"]
@@ -0,0 +1,54 @@
+from react_agent.utils import (
+    LRUCache,
+    cluster_similar,
+    jaccard,
+    novelty,
+    reciprocal_rank_fusion,
+    shingles,
+)
+
+
+def test_shingles_short_text() -> None:
+    assert shingles("Hello, World") == {"hello world"}
+    assert shingles("") == set()
+
+
+def test_novelty() -> None:
+    earlier = "Use a message queue to decouple the ingestion service from the API."
+    assert novelty(earlier, [earlier]) == 0.0
+    assert novelty("Cache the hot rows in Redis with a short TTL.", [earlier]) == 1.0
+    partial = novelty(earlier + " Also cache the hot rows in Redis.", [earlier])
+    assert 0.0 < partial < 1.0
+
+
+def test_jaccard() -> None:
+    assert jaccard({"a", "b"}, {"b", "c"}) == 1 / 3
+    assert jaccard(set(), set()) == 1.0
+
+
+def test_cluster_similar() -> None:
+    texts = [
+        "Backend developer focused on scalable REST APIs and databases",
+        "Mobile developer focused on offline sync",
+        "Backend developer focused on scalable REST APIs and data stores",
+    ]
+    clusters = cluster_similar(texts, threshold=0.5)
+    assert [[i for i, _ in cluster] for cluster in clusters] == [[0, 2], [1]]
+
+
+def test_lru_cache() -> None:
+    cache = LRUCache(maxsize=2)
+    assert cache.get_or_set("a", lambda: 1) == 1
+    assert cache.get_or_set("a", lambda: 2) == 1
+    cache.get_or_set("b", lambda: 2)
+    cache.get_or_set("c", lambda: 3)
+    assert cache.get_or_set("a", lambda: 4) == 4
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_reciprocal_rank_fusion_dedups_urls() -> None:
+    a = [{"url": "x", "content": "from a"}, {"url": "y"}, {"url": "z"}]
+    b = [{"url": "y"}, {"url": "x", "content": "from b"}, {"url": "w"}]
+    fused = reciprocal_rank_fusion([a, b])
+    assert [r["url"] for r in fused] == ["x", "y", "z", "w"]
+    assert fused[0]["content"] == "from a"
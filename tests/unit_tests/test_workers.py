@@ -0,0 +1,82 @@
+import os
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from react_agent.configuration import Configuration
+from react_agent.schemas import developer
+from react_agent.workers import (
+    InterviewWorkerPool,
+    JobQueue,
+    decode_payload,
+    encode_payload,
+)
+
+
+def test_payload_round_trip() -> None:
+    payload = {
+        "developer": developer(
+            affiliation="Acme", name="Ada", role="Backend", description="APIs"
+        ),
+        "messages": [HumanMessage(content="So you said you were writing an article?")],
+    }
+    decoded = decode_payload(encode_payload(payload))
+    assert decoded["developer"].persona == payload["developer"].persona
+    assert decoded["messages"][0].content == payload["messages"][0].content
+
+
+def test_job_queue_retries_then_fails(tmp_path) -> None:
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue("batch", ["a", "b"], max_attempts=2)
+
+    job_id, payload = queue.claim("batch", "w1")
+    assert payload == "a"
+    queue.complete(job_id, {"sections": ["A"]})
+
+    job_id, payload = queue.claim("batch", "w1")
+    assert payload == "b"
+    queue.fail(job_id, "boom")
+    assert queue.outstanding("batch") == 1
+
+    job_id, _ = queue.claim("batch", "w2")
+    assert queue.release_worker("batch", "w2", "crashed") == 1
+    assert queue.outstanding("batch") == 0
+    assert [job["status"] for job in queue.results("batch")] == ["done", "failed"]
+    assert queue.delete_batch("batch") == 2
+    assert queue.results("batch") == []
+
+
+def test_job_queue_reclaims_expired_lease(tmp_path) -> None:
+    queue = JobQueue(str(tmp_path / "queue.sqlite"), lease_seconds=-1)
+    queue.enqueue("batch", ["a"])
+    first, _ = queue.claim("batch", "w1")
+    second, _ = queue.claim("batch", "w2")
+    assert first == second
+    assert queue.results("batch")[0]["attempts"] == 2
+
+
+def _crash_on_start(*args) -> None:
+    os._exit(3)
+
+
+def test_pool_gives_up_on_workers_that_die_before_claiming(tmp_path) -> None:
+    pool = InterviewWorkerPool(
+        2, str(tmp_path / "queue.sqlite"), max_attempts=1, poll_interval=0.05
+    )
+    pool.worker_target = _crash_on_start
+    payloads = [
+        {
+            "developer": developer(
+                affiliation="Acme", name=name, role="Backend", description="APIs"
+            ),
+            "messages": [HumanMessage(content="Hi")],
+        }
+        for name in ("Ada", "Bob")
+    ]
+
+    with pytest.raises(RuntimeError, match="2 interview job.*exit code 3"):
+        pool.run(payloads, Configuration())
+
+    # The batch is removed from the queue once run() returns
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    assert queue._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0